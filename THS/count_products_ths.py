@@ -1,28 +1,15 @@
-import csv
+import os
+import sys
 
-def count_products_with_title(file_path):
-    with open(file_path, newline='', encoding='utf-8-sig') as csvfile:
-        reader = csv.DictReader(csvfile)
+##################################################################
+#  THS: räkningen av huvudprodukter görs nu av valideringen i paketet woo_to_shopify,
+#  som kör alla kontroller i ett pass över profilens output.
+#  Samma sak som: python -m woo_to_shopify validate --profile THS/profile.json --rules main_products [flaggor]
+##################################################################
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(HERE))
 
-        # Försök hitta kolumn som motsvarar Title
-        header = reader.fieldnames
-        title_col = None
-        for col in header:
-            if col.strip().lower() == "title":
-                title_col = col
-                break
+from woo_to_shopify.cli import main
 
-        if not title_col:
-            print("❌ Kunde inte hitta en 'Title'-kolumn i CSV-filen.")
-            print(f"🧪 Kolumnrubriker hittade: {header}")
-            return
-
-        count = 0
-        for row in reader:
-            if row.get(title_col, "").strip():
-                count += 1
-
-        print(f"📦 Antal produkter med titel (huvudprodukter): {count}")
-
-# Kör funktionen
-count_products_with_title("shopify_ths_import.csv")
\ No newline at end of file
+if __name__ == "__main__":
+    main(["validate", "--profile", os.path.join(HERE, "profile.json"), "--rules", "main_products"] + sys.argv[1:])
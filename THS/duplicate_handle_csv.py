@@ -1,33 +1,15 @@
-import csv
-from collections import Counter
+import os
+import sys
 
-def find_duplicate_main_handles(file_path):
-    handles = []
+##################################################################
+#  THS: dubblettkontrollen av handles görs nu av valideringen i paketet woo_to_shopify,
+#  som kör alla kontroller i ett pass över profilens output.
+#  Samma sak som: python -m woo_to_shopify validate --profile THS/profile.json --rules duplicate_handles [flaggor]
+##################################################################
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(HERE))
 
-    with open(file_path, newline='', encoding='utf-8-sig') as csvfile:
-        reader = csv.DictReader(csvfile)
-        for row in reader:
-            title = row.get("Title", "").strip()
-            description = row.get("Description", "").strip()
-            tags = row.get("Tags", "").strip()
-            handle = row.get("URL handle", "").strip()
+from woo_to_shopify.cli import main
 
-            # Identifiera huvudprodukt: har Title och antingen Description eller Tags
-            if title and (description or tags) and handle:
-                handles.append(handle)
-
-    counter = Counter(handles)
-    duplicates = {handle: count for handle, count in counter.items() if count > 1}
-
-    print(f"🔍 Totalt antal huvudprodukter med unika handles: {len(counter)}")
-    print(f"⚠️ Antal dubbletter bland huvudprodukter: {len(duplicates)}")
-
-    if duplicates:
-        print("\n📄 Dubbletter (handle → antal förekomster):")
-        for handle, count in sorted(duplicates.items(), key=lambda x: -x[1]):
-            print(f"- {handle}: {count} gånger")
-    else:
-        print("✅ Inga dubbletter bland huvudprodukter hittades!")
-
-# Kör funktionen
-find_duplicate_main_handles("shopify_ths_import.csv")
+if __name__ == "__main__":
+    main(["validate", "--profile", os.path.join(HERE, "profile.json"), "--rules", "duplicate_handles"] + sys.argv[1:])
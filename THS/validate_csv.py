@@ -1,14 +1,15 @@
-import csv
+import os
+import sys
 
-def check_row_length_mismatch(file_path):
-    with open(file_path, newline='', encoding='utf-8') as csvfile:
-        reader = csv.reader(csvfile)
-        header = next(reader)
-        expected_length = len(header)
+##################################################################
+#  THS: radlängdskontrollen (och övriga regler) görs nu av valideringen i paketet woo_to_shopify,
+#  som kör alla kontroller i ett pass över profilens output.
+#  Samma sak som: python -m woo_to_shopify validate --profile THS/profile.json [flaggor]
+##################################################################
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(HERE))
 
-        for i, row in enumerate(reader, start=2):
-            if len(row) != expected_length:
-                print(f"⚠️ Rad {i} har {len(row)} kolumner istället för {expected_length}: {row}")
-
-check_row_length_mismatch("shopify_ths_import.csv")
+from woo_to_shopify.cli import main
 
+if __name__ == "__main__":
+    main(["validate", "--profile", os.path.join(HERE, "profile.json")] + sys.argv[1:])
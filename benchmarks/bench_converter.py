@@ -0,0 +1,139 @@
+import os
+import io
+import sys
+import json
+import time
+import argparse
+import tempfile
+import subprocess
+from contextlib import redirect_stdout
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+from woo_catalog import generate_catalog, HEADERS
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_PROFILE = os.path.join(REPO_ROOT, "THS", "profile.json")
+sys.path.insert(0, REPO_ROOT)
+
+from woo_to_shopify import choose_mapping_from_file, load_profile, open_csv_input, replace_header_and_transform_data
+
+###################################################################
+# Benchmark av replace_header_and_transform_data
+#
+# Varje fall körs i en egen process så att peak RSS inte läcker mellan
+# fallen. Fas-tiderna (read / map / sanitize / group / chunk / write) kommer
+# från konverterarens egna ConversionMetrics.
+#   serial     – replace_header_and_transform_data
+#   streaming  – replace_header_and_transform_data(streaming=True)
+#   workers=N  – replace_header_and_transform_data(workers=N)
+###################################################################
+def peak_rss_mb():
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux rapporterar kB, macOS byte
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+# Samma inläsning som konverteringen (BOM:ar, avgränsaren känns av om den inte anges)
+def count_rows(input_file, delimiter=None):
+    with open_csv_input(input_file, delimiter) as source:
+        return sum(1 for row in source.rows() if row)
+
+
+# Körs i barnprocessen: ett fall, resultatet skrivs som JSON på stdout
+def run_case(profile_path, mode, input_file, delimiter):
+    profile = load_profile(profile_path)
+    output_file = os.path.join(tempfile.gettempdir(), f"bench_{os.getpid()}_{mode.replace('=', '')}.csv")
+    metrics_file = os.path.splitext(output_file)[0] + ".json"
+    rows = count_rows(input_file, delimiter)
+
+    with redirect_stdout(io.StringIO()):
+        mapping = choose_mapping_from_file(input_file, delimiter=delimiter)
+        kwargs = {'streaming': True} if mode == 'streaming' else {}
+        if mode.startswith('workers='):
+            kwargs['workers'] = int(mode.split('=')[1])
+        start = time.perf_counter()
+        # metrics_file slår på tidtagningen av sanitize
+        metrics = replace_header_and_transform_data(input_file, output_file, mapping, delimiter=delimiter, profile=profile,
+                                                    metrics_file=metrics_file, **kwargs)
+        elapsed = time.perf_counter() - start
+        phases = metrics.as_dict()['phases']
+
+    os.remove(output_file)
+    os.remove(metrics_file)
+    return {
+        'mode': mode,
+        'rows': rows,
+        'seconds': round(elapsed, 3),
+        'rows_per_sec': round(rows / elapsed) if elapsed else None,
+        'peak_rss_mb': peak_rss_mb(),
+        'phases': {name: round(seconds, 3) for name, seconds in phases.items()},
+    }
+
+
+def run_case_in_subprocess(profile_path, mode, input_file, delimiter):
+    command = [sys.executable, os.path.abspath(__file__), '--child', mode, '--profile', profile_path, '--input', input_file]
+    if delimiter:
+        command += ['--delimiter', delimiter]
+    result = subprocess.run(command, capture_output=True, text=True, check=True)
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def print_report(label, results):
+    print(f"\n📊 {label}")
+    print(f"{'mode':<12}{'rows':>9}{'sek':>9}{'rader/s':>10}{'RSS MB':>9}  faser")
+    for r in results:
+        phases = ", ".join(f"{name} {seconds:.2f}s" for name, seconds in r['phases'].items())
+        rss = '-' if r['peak_rss_mb'] is None else f"{r['peak_rss_mb']:.1f}"
+        print(f"{r['mode']:<12}{r['rows']:>9}{r['seconds']:>9.2f}{r['rows_per_sec'] or 0:>10}{rss:>9}  {phases}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark av Woo → Shopify-konverteraren")
+    parser.add_argument("--profile", default=DEFAULT_PROFILE, help="butiksprofilen som konverteringen körs med")
+    parser.add_argument("--input", help="befintlig export att mäta i stället för en syntetisk")
+    parser.add_argument("--delimiter", default=None,
+                        help="avgränsare (standard: känns av från exporten; syntetiska exporter skrivs med ',')")
+    parser.add_argument("--dialect", choices=sorted(HEADERS) + ['both'], default='both')
+    parser.add_argument("--products", type=int, default=2000)
+    parser.add_argument("--variants", type=int, default=20)
+    parser.add_argument("--variable-share", type=float, default=0.5)
+    parser.add_argument("--description-size", type=int, default=1500)
+    parser.add_argument("--images", type=int, default=3)
+    parser.add_argument("--modes", default="serial,streaming", help="kommaseparerat, t.ex. serial,streaming,workers=4")
+    parser.add_argument("--json", help="spara resultaten som JSON (för att jämföra körningar)")
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(run_case(args.profile, args.child, args.input, args.delimiter)))
+        sys.exit(0)
+
+    modes = [m.strip() for m in args.modes.split(',') if m.strip()]
+    report = {}
+
+    with tempfile.TemporaryDirectory() as tmp:
+        if args.input:
+            inputs = {os.path.basename(args.input): args.input}
+        else:
+            inputs = {}
+            for dialect in (sorted(HEADERS) if args.dialect == 'both' else [args.dialect]):
+                path = os.path.join(tmp, f"woo_{dialect}.csv")
+                rows = generate_catalog(path, args.products, args.variants, args.variable_share,
+                                        args.description_size, args.images, dialect, args.delimiter or ',')
+                print(f"🧪 {dialect}: {rows} syntetiska rader ({os.path.getsize(path) / 1e6:.1f} MB)")
+                inputs[dialect] = path
+
+        for label, path in inputs.items():
+            report[label] = [run_case_in_subprocess(args.profile, mode, path, args.delimiter) for mode in modes]
+            print_report(label, report[label])
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+        print(f"\n💾 Resultat sparade i {args.json}")
@@ -0,0 +1,80 @@
+import os
+import re
+import csv
+import json
+import timeit
+import argparse
+
+from bench_converter import REPO_ROOT
+from woo_to_shopify import sanitize_html
+
+DEFAULT_INPUT = os.path.join(REPO_ROOT, "THS", "thsexport2.csv")
+
+###################################################################
+# Benchmark av sanitize_html mot den tidigare regex-versionen
+#
+# Kör båda på samma celler (som standard Description/Beskrivning i
+# thsexport2.csv), kontrollerar att resultaten är identiska och
+# rapporterar bästa tiden av --repeat körningar.
+###################################################################
+def legacy_sanitize_html(value):
+    if not isinstance(value, str) or value.strip() == "":
+        return ""
+    value = value.replace('\r\n', '<br>').replace('\n', '<br>').replace('\\n', '<br>')
+    value = re.sub(r'\s+', ' ', value)
+    value = value.replace('"', '""')
+    return value.strip()
+
+
+def load_cells(input_file, delimiter, columns):
+    with open(input_file, 'r', encoding='utf-8-sig') as f:
+        reader = csv.reader(f, delimiter=delimiter)
+        header = [name.lstrip('\ufeff') for name in next(reader, [])]
+        indexes = [i for i, name in enumerate(header) if columns is None or name in columns]
+        if not indexes:
+            raise ValueError(f"❌ Ingen av kolumnerna {', '.join(columns)} finns i {input_file}")
+        return [row[i] for row in reader for i in indexes if i < len(row)]
+
+
+def best_time(function, cells, repeat):
+    return min(timeit.repeat(lambda: [function(value) for value in cells], number=1, repeat=repeat))
+
+
+def run(input_file, delimiter, columns, repeat):
+    cells = load_cells(input_file, delimiter, columns)
+
+    mismatches = [value for value in cells if sanitize_html(value) != legacy_sanitize_html(value)]
+    if mismatches:
+        raise SystemExit(f"❌ {len(mismatches)} celler skiljer sig, t.ex. {mismatches[0][:80]!r}")
+
+    legacy = best_time(legacy_sanitize_html, cells, repeat)
+    current = best_time(sanitize_html, cells, repeat)
+    return {
+        'cells': len(cells),
+        'avg_chars': round(sum(map(len, cells)) / len(cells)) if cells else 0,
+        'legacy_seconds': round(legacy, 4),
+        'current_seconds': round(current, 4),
+        'speedup': round(legacy / current, 2) if current else None,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Jämför sanitize_html med den tidigare regex-versionen")
+    parser.add_argument("--input", default=DEFAULT_INPUT)
+    parser.add_argument("--delimiter", default=';')
+    parser.add_argument("--columns", default="Description,Beskrivning", help="kommaseparerat; 'all' = alla celler")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--json", help="spara resultatet som JSON")
+    args = parser.parse_args()
+
+    columns = None if args.columns == 'all' else {c.strip() for c in args.columns.split(',')}
+    result = run(args.input, args.delimiter, columns, args.repeat)
+
+    print(f"📊 {os.path.basename(args.input)}: {result['cells']} celler, i snitt {result['avg_chars']} tecken")
+    print(f"   tidigare:  {result['legacy_seconds']:.4f}s")
+    print(f"   nu:        {result['current_seconds']:.4f}s  ({result['speedup']}x)")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(result, f, indent=2, ensure_ascii=False)
+        print(f"💾 Resultat sparat i {args.json}")
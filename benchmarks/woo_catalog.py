@@ -0,0 +1,144 @@
+import csv
+import random
+import argparse
+
+###################################################################
+# Syntetisk WooCommerce-export för benchmarks av konverteraren
+###################################################################
+# Kolumnrubriker per dialekt, i samma ordning som en riktig Woo-export
+HEADERS = {
+    'sv': {
+        'id': 'ID', 'type': 'Typ', 'sku': 'Artikelnummer', 'name': 'Namn', 'published': 'Publicerad',
+        'visibility': 'Synlighet i katalog', 'short': 'Kort beskrivning', 'description': 'Beskrivning',
+        'tax_status': 'Momsstatus', 'tax_class': 'Momsklass', 'stock': 'Lager', 'backorders': 'Tillåt restnoteringar?',
+        'weight': 'Vikt (kg)', 'sale': 'Reapris', 'price': 'Ordinarie pris', 'categories': 'Kategorier',
+        'shipping': 'Fraktklass', 'images': 'Bilder', 'parent': 'Överordnad', 'gtin': 'GTIN, UPC, EAN eller ISBN',
+        'attr1_name': 'Attribut 1 namn', 'attr1_value': 'Attribut 1 värde(n)',
+        'attr2_name': 'Attribut 2 namn', 'attr2_value': 'Attribut 2 värde(n)',
+    },
+    'en': {
+        'id': 'ID', 'type': 'Type', 'sku': 'SKU', 'name': 'Name', 'published': 'Published',
+        'visibility': 'Visibility in catalog', 'short': 'Short description', 'description': 'Description',
+        'tax_status': 'Tax status', 'tax_class': 'Tax class', 'stock': 'Stock', 'backorders': 'Backorders allowed?',
+        'weight': 'Weight (kg)', 'sale': 'Sale price', 'price': 'Regular price', 'categories': 'Categories',
+        'shipping': 'Shipping class', 'images': 'Images', 'parent': 'Parent', 'gtin': 'GTIN, UPC, EAN, or ISBN',
+        'attr1_name': 'Attribute 1 name', 'attr1_value': 'Attribute 1 value(s)',
+        'attr2_name': 'Attribute 2 name', 'attr2_value': 'Attribute 2 value(s)',
+    },
+}
+
+OPTION_NAMES = {
+    'sv': {'foot': 'Fotstorlek', 'color': 'Färg', 'size': 'Storlek', 'width': 'Bredd'},
+    'en': {'foot': 'Foot Size', 'color': 'Color', 'size': 'Size', 'width': 'Width'},
+}
+
+PRODUCT_NAMES = ['Schabrak', 'Grimma', 'Ridstövel', 'Täcke', 'Hjälm', 'Benskydd', 'Träns', 'Sadelgjord']
+COLORS = ['Svart', 'Brun', 'Blå', 'Röd', 'Grön', 'Vit', 'Grå', 'Rosa']
+SIZES = ['XS', 'S', 'M', 'L', 'XL', 'Pony', 'Cob', 'Full']
+WORDS = ['häst', 'ryttare', 'läder', 'mjuk', 'slitstark', 'vattentät', 'andas', 'passform', 'stall', 'tävling']
+
+
+def make_description(rng, size):
+    if size <= 0:
+        return ''
+    parts = []
+    length = 0
+    while length < size:
+        sentence = ' '.join(rng.choice(WORDS) for _ in range(8)).capitalize()
+        # Radbrytningar, mellanslag i rad och citattecken som sanitize_html måste hantera
+        sentence += rng.choice(['.\n', '.  ', '. "Bästa valet"\r\n', '.\\n', '. '])
+        parts.append(sentence)
+        length += len(sentence)
+    return '<p>' + ''.join(parts)[:size] + '</p>'
+
+
+def make_images(rng, product_id, count, prefix=''):
+    return ', '.join(
+        f'https://example.se/wp-content/uploads/2024/0{rng.randint(1, 9)}/{prefix}produkt {product_id} bild {n}.jpg'
+        for n in range(count)
+    )
+
+
+#####################################################
+# Skriv en syntetisk export till path
+#   products         antal huvudprodukter
+#   variants         antal varianter per variabel produkt (fan-out)
+#   variable_share   andel huvudprodukter som är variabla
+#   description_size ungefärligt antal tecken i Beskrivning
+#   images           antal bilder per huvudprodukt
+#   dialect          'sv' eller 'en' kolumnrubriker
+# Returnerar antalet datarader som skrevs.
+#####################################################
+def generate_catalog(path, products=1000, variants=20, variable_share=0.5, description_size=1500,
+                     images=3, dialect='sv', delimiter=',', seed=42):
+    rng = random.Random(seed)
+    columns = HEADERS[dialect]
+    options = OPTION_NAMES[dialect]
+    keys = list(columns.keys())
+    rows_written = 0
+    next_id = 1000
+
+    with open(path, 'w', encoding='utf-8-sig', newline='') as f:
+        writer = csv.writer(f, delimiter=delimiter)
+        writer.writerow([columns[k] for k in keys])
+
+        for p in range(products):
+            next_id += 1
+            parent_id = next_id
+            name = f"{rng.choice(PRODUCT_NAMES)} {rng.choice(['Classic', 'Pro', 'Comfort', ''])}".strip()
+            variable = variants > 0 and rng.random() < variable_share
+            boots = name.startswith('Ridstövel')
+            main = {
+                'id': parent_id, 'type': 'variable' if variable else 'simple', 'sku': f'P{parent_id}', 'name': name,
+                'published': '1', 'visibility': rng.choice(['visible', 'visible', 'hidden']),
+                'short': 'Kort beskrivning av produkten', 'description': make_description(rng, description_size),
+                'tax_status': 'taxable', 'tax_class': '', 'stock': str(rng.randint(0, 50)),
+                'backorders': rng.choice(['notify', '0']), 'weight': rng.choice(['0.4', '1.25', '']),
+                'sale': '', 'price': '' if variable else str(rng.randint(99, 2999)),
+                'categories': f"Häst > {name.split()[0]} > {rng.choice(COLORS)}", 'shipping': '',
+                'images': make_images(rng, parent_id, images), 'parent': '', 'gtin': str(7300000000000 + parent_id),
+                'attr1_name': options['foot'] if boots else options['color'], 'attr1_value': '',
+                'attr2_name': options['width'] if boots else options['size'], 'attr2_value': '',
+            }
+            writer.writerow([main[k] for k in keys])
+            rows_written += 1
+
+            if not variable:
+                continue
+
+            for v in range(variants):
+                next_id += 1
+                if boots:
+                    value1, value2 = str(33 + v % 14), ['Smal', 'Normal', 'Bred'][v // 14 % 3]
+                else:
+                    value1, value2 = COLORS[v % len(COLORS)], SIZES[v // len(COLORS) % len(SIZES)]
+                variant = dict(main)
+                variant.update({
+                    'id': next_id, 'type': 'variation', 'sku': f'P{parent_id}-{v}', 'name': f'{name} - {value1}, {value2}',
+                    'short': '', 'description': '', 'stock': str(rng.randint(-2, 20)),
+                    'price': str(rng.randint(99, 2999)), 'sale': rng.choice(['', '', str(rng.randint(49, 99))]),
+                    'categories': '', 'images': make_images(rng, next_id, 1, 'variant ') if rng.random() < 0.2 else '',
+                    'parent': f'id:{parent_id}', 'attr1_value': value1, 'attr2_value': value2,
+                })
+                writer.writerow([variant[k] for k in keys])
+                rows_written += 1
+
+    return rows_written
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generera en syntetisk WooCommerce-export")
+    parser.add_argument("output")
+    parser.add_argument("--products", type=int, default=1000)
+    parser.add_argument("--variants", type=int, default=20)
+    parser.add_argument("--variable-share", type=float, default=0.5)
+    parser.add_argument("--description-size", type=int, default=1500)
+    parser.add_argument("--images", type=int, default=3)
+    parser.add_argument("--dialect", choices=sorted(HEADERS), default='sv')
+    parser.add_argument("--delimiter", default=',')
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    rows = generate_catalog(args.output, args.products, args.variants, args.variable_share, args.description_size,
+                            args.images, args.dialect, args.delimiter, args.seed)
+    print(f"✅ {rows} rader skrivna till {args.output}")
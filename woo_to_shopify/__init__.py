@@ -0,0 +1,17 @@
+# WooCommerce-export → Shopify CSV.
+# Butikernas skillnader (vendor, standardvärden, sökvägar) ligger i profiler,
+# se profiles.py. Kommandorad: python -m woo_to_shopify <profil> [<profil> ...]
+# eller python -m woo_to_shopify convert-all <mapp> för alla exporter i en mapp.
+# Bilderna kan kontrolleras mot en lokal kopia av uploads med check-images (media.py).
+from .batch import convert_directory
+from .catalog import catalog_to_csv, read_catalog_table
+from .converter import CompiledMapping, choose_mapping, choose_mapping_from_file, replace_header_and_transform_data, transform_row
+from .csvinput import CsvInput, open_csv_input
+from .handles import HandleRegistry, load_existing_handles, sanitize_title
+from .images import ImageRegistry
+from .media import check_export_images, load_image_manifest
+from .metrics import PHASES, ConversionMetrics
+from .profiles import StoreProfile, load_profile
+from .splitting import VariantSplitter
+from .text import sanitize_html
+from .validate import validate_shopify_csv
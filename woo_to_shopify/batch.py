@@ -0,0 +1,107 @@
+import io
+import os
+import glob
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import redirect_stdout
+
+from .converter import DEFAULT_PROFILE, is_woo_export, replace_header_and_transform_data
+from .csvinput import open_csv_input
+from .profiles import load_profile
+
+###################################################################
+# convert-all: konvertera alla Woo-exporter i en mapp parallellt
+#
+# Varje *.csv i mappen (utom tidigare Shopify-filer, shopify_*.csv) körs
+# som ett eget jobb i processpoolen. Avgränsare och mappning känns av per
+# fil från headern; filer som inte är Woo-exporter hoppas över.
+# Resultatet skrivs bredvid exporten som shopify_<namn>.csv tillsammans
+# med en logg (shopify_<namn>.log) över det som skrevs ut under körningen,
+# även när filen hoppades över eller konverteringen misslyckades.
+###################################################################
+OUTPUT_PREFIX = "shopify_"
+
+def find_exports(directory):
+    return sorted(
+        path for path in glob.glob(os.path.join(directory, "*.csv"))
+        if not os.path.basename(path).startswith(OUTPUT_PREFIX)
+    )
+
+
+# Profilens output gäller bara för profilens egen input; övriga filer får shopify_<namn>.csv
+def output_path_for(input_file, profile):
+    if profile.input and profile.output and os.path.abspath(profile.input) == os.path.abspath(input_file):
+        return profile.output
+    stem = os.path.splitext(os.path.basename(input_file))[0]
+    return os.path.join(os.path.dirname(input_file), f"{OUTPUT_PREFIX}{stem}.csv")
+
+
+# Körs i en arbetsprocess: en fil, returnerar en rad till sammanfattningen.
+# Filen öppnas en gång; saknar headern Woo-kolumnerna (Typ/Type och Namn/Name)
+# hoppas den över. Alla andra fel under konverteringen redovisas som fel.
+# Loggen skrivs alltid.
+def convert_file(input_file, output_file, profile, delimiter=None, streaming=False):
+    summary = {'file': os.path.basename(input_file), 'output': output_file, 'status': 'ok'}
+    log = io.StringIO()
+    start = time.perf_counter()
+    metrics = None
+    try:
+        with redirect_stdout(log), open_csv_input(input_file, delimiter) as source:
+            if is_woo_export(source.fieldnames):
+                metrics = replace_header_and_transform_data(input_file, output_file, delimiter=delimiter, streaming=streaming,
+                                                            profile=profile, source=source)
+            else:
+                print("⚠️ Ingen Woo-export (kolumnerna Typ/Type och Namn/Name saknas), hoppas över")
+                summary['status'] = "hoppades över: ingen Woo-export"
+    except Exception as e:
+        summary['status'] = f"fel: {e}"
+        log.write(traceback.format_exc())
+    summary['seconds'] = round(time.perf_counter() - start, 2)
+
+    if metrics is not None:
+        rows_in = metrics.counters['rows_in']
+        summary['rows'] = sum(rows_in.values())
+        summary['products'] = rows_in['simple'] + rows_in['variable']
+        summary['variants'] = rows_in['variation']
+        summary['rows_out'] = sum(metrics.counters['rows_out'].values())
+    with open(os.path.splitext(output_file)[0] + ".log", 'w', encoding='utf-8') as f:
+        f.write(log.getvalue())
+    return summary
+
+
+def convert_directory(directory, profile=None, delimiter=None, streaming=False, jobs=None):
+    if profile is None:
+        profile_file = os.path.join(directory, "profile.json")
+        profile = load_profile(profile_file) if os.path.exists(profile_file) else DEFAULT_PROFILE
+    delimiter = delimiter or profile.delimiter
+
+    exports = find_exports(directory)
+    if not exports:
+        print(f"⚠️ Inga CSV-filer hittades i {directory}")
+        return []
+
+    print(f"📂 {len(exports)} exporter i {directory} ({profile.name})")
+    results = {}
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        futures = {
+            executor.submit(convert_file, path, output_path_for(path, profile), profile, delimiter, streaming): path
+            for path in exports
+        }
+        for future in as_completed(futures):
+            summary = future.result()
+            results[futures[future]] = summary
+            print(f"{'✅' if summary['status'] == 'ok' else '⚠️'} {summary['file']} ({summary['seconds']:.2f}s)")
+
+    summaries = [results[path] for path in exports]
+    print_summary(summaries)
+    return summaries
+
+
+def print_summary(summaries):
+    print(f"\n📊 {'fil':<28}{'rader':>9}{'produkter':>11}{'varianter':>11}{'rader ut':>10}{'sek':>8}  status")
+    for s in summaries:
+        print(f"   {s['file']:<28}{s.get('rows', '-'):>9}{s.get('products', '-'):>11}{s.get('variants', '-'):>11}"
+              f"{s.get('rows_out', '-'):>10}{s['seconds']:>8.2f}  {s['status']}")
+    done = [s for s in summaries if s['status'] == 'ok']
+    print(f"   {len(done)} av {len(summaries)} filer konverterade, {sum(s['rows'] for s in done)} rader totalt")
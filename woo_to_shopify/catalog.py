@@ -0,0 +1,248 @@
+import os
+import csv
+import json
+from collections import defaultdict
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = pq = None
+
+###################################################################
+# Katalogfil: den konverterade katalogen som kolumntabeller (Parquet)
+#
+# Med --catalog <mapp> skrivs tre tabeller i samma pass som Shopify-CSV:n:
+#   products.parquet  en rad per handle: URL handle + produktfälten (Title, Description, ...)
+#   variants.parquet  en rad per variant: URL handle, position + övriga Shopify-kolumner
+#                     (position 1 är huvudraden)
+#   images.parquet    en rad per bild: URL handle, position, Product image URL
+# Kolumnerna i expected_data_types sparas typade (float/int/bool) när alla
+# värden blir exakt samma text igen, annars som text. Raderna skrivs i
+# radgrupper om FLUSH_ROWS medan konverteringen pågår. Kontroller och diffar
+# kan läsa bara de kolumner de behöver (read_catalog_table, minnesmappat),
+# och catalog_to_csv skriver samma Shopify-CSV igen utan Woo-exporten.
+# Kräver paketet pyarrow.
+###################################################################
+CATALOG_TABLES = ('products', 'variants', 'images')
+HANDLE = 'URL handle'
+IMAGE = 'Product image URL'
+POSITION = 'position'
+ARROW_TYPES = {float: 'float64', int: 'int64', bool: 'bool_'}
+FLUSH_ROWS = 16384
+
+def require_pyarrow():
+    if pa is None:
+        raise ValueError("❌ Katalogfilen (Parquet) kräver paketet pyarrow")
+
+
+def parse_typed(value, data_type):
+    if data_type is bool:
+        return {'True': True, 'False': False}[value]
+    return data_type(value)
+
+
+# Värdet som text, som csv.writer skriver det (ShopifyRow kan innehålla t.ex. float)
+def cell_text(value):
+    if value.__class__ is str:
+        return value
+    return '' if value is None else str(value)
+
+
+# Typade värden om alla går tillbaka till samma text, annars None ('' → null)
+def typed_values(values, data_type):
+    try:
+        typed = [None if value == '' else parse_typed(value, data_type) for value in values]
+    except (ValueError, KeyError):
+        return None
+    if all(t is None or str(t) == value for t, value in zip(typed, values)):
+        return typed
+    return None
+
+
+# Samlar raderna som ShopifyWriter skriver och sparar dem som tabeller.
+# Raderna buffras högst FLUSH_ROWS åt gången per tabell och skrivs sedan som
+# en radgrupp med text i en temporär fil, så minnet inte växer med katalogen
+# (viktigt med --streaming). Om en kolumn kan sparas typad avgörs löpande för
+# varje radgrupp; i close() skrivs de temporära filerna om radgrupp för
+# radgrupp med de slutliga typerna.
+class CatalogWriter:
+    def __init__(self, path, product_fields, types):
+        require_pyarrow()
+        self.path = path
+        self.product_fields = product_fields
+        self.types = types
+        self.header = None
+
+    def start(self, header, delimiter=','):
+        self.header = list(header)
+        self.delimiter = delimiter
+        self.handle_index = self.header.index(HANDLE)
+        self.image_index = self.header.index(IMAGE)
+        product_columns = [HANDLE] + [name for name in self.product_fields if name in self.header]
+        variant_columns = [name for name in self.header if name not in product_columns]
+        self.product_columns = [(name, self.header.index(name)) for name in product_columns]
+        self.variant_columns = [(name, self.header.index(name)) for name in variant_columns]
+        self.tables = {
+            'products': {name: [] for name in product_columns},
+            'variants': {name: [] for name in [HANDLE, POSITION] + variant_columns},
+            'images': {HANDLE: [], POSITION: [], IMAGE: []},
+        }
+        # Kolumner som fortfarande kan sparas typade, per tabell
+        self.typed = {name: {column for column in table if self.types.get(column) in ARROW_TYPES}
+                      for name, table in self.tables.items()}
+        self.counts = dict.fromkeys(CATALOG_TABLES, 0)
+        self.spill = {}  # tabell → ParquetWriter för den temporära filen
+        os.makedirs(self.path, exist_ok=True)
+        self.positions = defaultdict(lambda: [0, 0])  # handle → [varianter, bilder]
+
+    def product(self, values):
+        products = self.tables['products']
+        for name, i in self.product_columns:
+            products[name].append(values[i])
+        self.variant(values)
+        if values[self.image_index]:
+            self.image(values[self.handle_index], values[self.image_index])
+        if len(products[HANDLE]) >= FLUSH_ROWS:
+            self.flush('products')
+
+    def variant(self, values):
+        handle = values[self.handle_index]
+        position = self.positions[handle]
+        position[0] += 1
+        variants = self.tables['variants']
+        variants[HANDLE].append(handle)
+        variants[POSITION].append(position[0])
+        for name, i in self.variant_columns:
+            variants[name].append(values[i])
+        if len(variants[HANDLE]) >= FLUSH_ROWS:
+            self.flush('variants')
+
+    def image(self, handle, image):
+        position = self.positions[handle]
+        position[1] += 1
+        images = self.tables['images']
+        images[HANDLE].append(handle)
+        images[POSITION].append(position[1])
+        images[IMAGE].append(image)
+        if len(images[HANDLE]) >= FLUSH_ROWS:
+            self.flush('images')
+
+    def spill_path(self, name):
+        return os.path.join(self.path, f".{name}.parquet.tmp")
+
+    # Skriv buffrade rader som en radgrupp (text) i den temporära filen
+    def flush(self, name):
+        columns = self.tables[name]
+        if not columns[HANDLE]:
+            return
+        typed = self.typed[name]
+        arrays = []
+        for column, values in columns.items():
+            if column == POSITION:
+                arrays.append(pa.array(values, pa.int32()))
+                continue
+            values = [cell_text(value) for value in values]
+            if column in typed and typed_values(values, self.types[column]) is None:
+                typed.discard(column)
+            arrays.append(pa.array(values, pa.string()))
+        table = pa.Table.from_arrays(arrays, names=list(columns))
+        if name not in self.spill:
+            self.spill[name] = pq.ParquetWriter(self.spill_path(name), table.schema)
+        self.spill[name].write_table(table)
+        self.counts[name] += table.num_rows
+        for values in columns.values():
+            values.clear()
+
+    def final_schema(self, name, metadata):
+        fields = []
+        for column in self.tables[name]:
+            if column == POSITION:
+                arrow_type = pa.int32()
+            elif column in self.typed[name]:
+                arrow_type = getattr(pa, ARROW_TYPES[self.types[column]])()
+            else:
+                arrow_type = pa.string()
+            fields.append(pa.field(column, arrow_type))
+        return pa.schema(fields, metadata=metadata)
+
+    def close(self):
+        metadata = {
+            b'shopify_header': json.dumps(self.header, ensure_ascii=False).encode('utf-8'),
+            b'delimiter': self.delimiter.encode('utf-8'),
+        }
+        for name in CATALOG_TABLES:
+            self.flush(name)
+            schema = self.final_schema(name, metadata)
+            with pq.ParquetWriter(os.path.join(self.path, f"{name}.parquet"), schema) as writer:
+                if name not in self.spill:
+                    writer.write_table(schema.empty_table())
+                    continue
+                self.spill.pop(name).close()
+                spilled = pq.ParquetFile(self.spill_path(name))
+                for i in range(spilled.num_row_groups):
+                    group = spilled.read_row_group(i)
+                    arrays = []
+                    for column, field in zip(group.column_names, schema):
+                        values = group.column(column)
+                        if column in self.typed[name]:
+                            values = pa.array(typed_values(values.to_pylist(), self.types[column]), field.type)
+                        arrays.append(values)
+                    writer.write_table(pa.Table.from_arrays(arrays, schema=schema))
+            os.remove(self.spill_path(name))
+        counts = ', '.join(f"{self.counts[name]} {name}" for name in CATALOG_TABLES)
+        print(f"🗄️ Katalog sparad: {self.path} ({counts})")
+
+
+##################
+##### LÄSA #######
+##################
+def read_catalog_table(path, table, columns=None):
+    require_pyarrow()
+    return pq.read_table(os.path.join(path, f"{table}.parquet"), columns=columns, memory_map=True)
+
+
+# Shopify-headern och avgränsaren som CSV:n skrevs med
+def catalog_header(path):
+    require_pyarrow()
+    metadata = pq.read_schema(os.path.join(path, "products.parquet")).metadata
+    return json.loads(metadata[b'shopify_header'].decode('utf-8')), metadata[b'delimiter'].decode('utf-8')
+
+
+def rows_by_handle(table):
+    grouped = defaultdict(list)
+    for row in table.to_pylist():
+        grouped[row[HANDLE]].append(row)
+    return grouped
+
+
+# En Shopify-rad i headerns ordning; första delen som har kolumnen vinner
+def catalog_row(header, *parts):
+    values = []
+    for name in header:
+        value = next((part[name] for part in parts if name in part), '')
+        values.append('' if value is None else str(value))
+    return values
+
+
+# Skriv Shopify-CSV:n från katalogfilen: huvudrad, extra bilder, övriga varianter per handle.
+# Utan delimiter används samma avgränsare som när katalogen skrevs.
+def catalog_to_csv(path, output_file, delimiter=None):
+    header, catalog_delimiter = catalog_header(path)
+    delimiter = delimiter or catalog_delimiter
+    variants = rows_by_handle(read_catalog_table(path, 'variants'))
+    images = rows_by_handle(read_catalog_table(path, 'images'))
+
+    with open(output_file, 'w', encoding='utf-8-sig', newline='') as outfile:
+        writer = csv.writer(outfile, delimiter=delimiter, quoting=csv.QUOTE_ALL)
+        writer.writerow(header)
+        for product in read_catalog_table(path, 'products').to_pylist():
+            handle = product[HANDLE]
+            rows = variants[handle]
+            writer.writerow(catalog_row(header, product, rows[0]))
+            for image in images[handle][1:]:
+                writer.writerow(catalog_row(header, {HANDLE: handle, IMAGE: image[IMAGE]}))
+            for row in rows[1:]:
+                writer.writerow(catalog_row(header, {HANDLE: handle}, row))
+
+    print(f" Shopify CSV created successfully from catalog: {output_file}")
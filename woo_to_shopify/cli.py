@@ -0,0 +1,167 @@
+import sys
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+
+from .batch import convert_directory
+from .catalog import catalog_to_csv
+from .converter import replace_header_and_transform_data
+from .handles import load_existing_handles
+from .media import check_export_images, image_replacements, load_image_manifest
+from .profiles import load_profile
+from .validate import VALIDATION_RULES, make_rules, print_validation_report, validate_shopify_csv, write_validation_report
+
+##################
+##### MAIN #######
+##################
+# python -m woo_to_shopify THS/profile.json SkaraHast/profile.json [flaggor]
+# python -m woo_to_shopify convert-all exporter/ [--jobs N] [--profile profil.json]
+# python -m woo_to_shopify catalog-csv katalog/ shopify.csv
+# python -m woo_to_shopify check-images export.csv uploads/ bilder.json
+# python -m woo_to_shopify validate shopify.csv [--report rapport.json]
+# Alla butiker konverteras i samma process, så cacharna (t.ex. sanitize_title)
+# och processpoolen för --workers delas mellan butikerna.
+SINGLE_STORE_OPTIONS = ('input', 'output', 'metrics', 'state', 'existing_handles', 'catalog', 'image_manifest',
+                        'invalid_report', 'validation_report', 'split_plan')
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="woo_to_shopify", description="Konvertera WooCommerce-exporter till Shopify CSV")
+    parser.add_argument("profiles", nargs="+", help="butiksprofiler (.json, .toml eller .yaml)")
+    parser.add_argument("--input", help="Woo-export (i stället för profilens input)")
+    parser.add_argument("--output", help="Shopify CSV (i stället för profilens output)")
+    parser.add_argument("--delimiter", help="CSV-avgränsare (standard: profilens delimiter, annars känns den av från filen)")
+    parser.add_argument("--max-rows", type=int, default=None)
+    parser.add_argument("--streaming", action="store_true", help="två pass, håller bara en produktgrupp i minnet åt gången")
+    parser.add_argument("--workers", type=int, default=1, help="antal processer för radtransformationen (1 = seriellt)")
+    parser.add_argument("--metrics", help="skriv fas-tider och räknare som JSON till denna fil")
+    parser.add_argument("--existing-handles", help="Shopify-export med handles som redan finns i butiken och inte får återanvändas")
+    parser.add_argument("--state", help="tillståndsfil för inkrementell körning; --output blir då en delta-CSV med bara nya/ändrade produkter")
+    parser.add_argument("--catalog", help="spara även katalogen som Parquet-tabeller (products/variants/images) i denna mapp; kräver pyarrow")
+    parser.add_argument("--invalid-report", help="skriv celler med ogiltiga tal (satta till 0) som CSV till denna fil")
+    parser.add_argument("--validation-report", help="spara valideringen av raderna som skrevs (validate-reglerna) som JSON till denna fil")
+    parser.add_argument("--no-validate", action="store_true", help="hoppa över valideringen av raderna medan de skrivs")
+    parser.add_argument("--split-plan", help="spara uppdelningen av stora produktfamiljer som JSON till denna fil")
+    parser.add_argument("--plan-only", action="store_true",
+                        help="räkna bara ut uppdelningen av stora produktfamiljer (med --split-plan), utan att skriva någon CSV")
+    parser.add_argument("--image-manifest", help="bildmanifest från check-images; saknade bilder tas bort ur CSV:n")
+    parser.add_argument("--missing-image", help="med --image-manifest: ersätt saknade bilder med denna URL i stället för att ta bort dem")
+    return parser
+
+
+def build_batch_parser():
+    parser = argparse.ArgumentParser(prog="woo_to_shopify convert-all",
+                                     description="Konvertera alla Woo-exporter i en mapp parallellt")
+    parser.add_argument("directory", help="mapp med Woo-exporter (*.csv); resultatet skrivs bredvid varje export")
+    parser.add_argument("--jobs", type=int, default=None, help="antal processer (standard: antal CPU:er)")
+    parser.add_argument("--profile", help="butiksprofil (standard: mappens profile.json om den finns)")
+    parser.add_argument("--delimiter", help="CSV-avgränsare (standard: profilens delimiter, annars känns den av per fil)")
+    parser.add_argument("--streaming", action="store_true", help="två pass, håller bara en produktgrupp i minnet åt gången")
+    return parser
+
+
+def build_catalog_parser():
+    parser = argparse.ArgumentParser(prog="woo_to_shopify catalog-csv",
+                                     description="Skriv Shopify CSV från en katalogmapp (--catalog)")
+    parser.add_argument("catalog", help="katalogmapp med products/variants/images.parquet")
+    parser.add_argument("output", help="Shopify CSV")
+    parser.add_argument("--delimiter", help="CSV-avgränsare (standard: samma som när katalogen skrevs)")
+    return parser
+
+
+def build_images_parser():
+    parser = argparse.ArgumentParser(prog="woo_to_shopify check-images",
+                                     description="Kontrollera exportens bilder mot en lokal kopia av wp-content/uploads")
+    parser.add_argument("input", help="Woo-export")
+    parser.add_argument("mirror", help="lokal kopia av wp-content/uploads")
+    parser.add_argument("manifest", help="bildmanifest (JSON) att skriva")
+    parser.add_argument("--delimiter", help="CSV-avgränsare (standard: känns av från filen)")
+    parser.add_argument("--threads", type=int, default=None, help="antal trådar för filkontrollerna")
+    return parser
+
+
+def build_validate_parser():
+    parser = argparse.ArgumentParser(prog="woo_to_shopify validate",
+                                     description="Kontrollera en Shopify CSV (alla regler i ett pass)")
+    parser.add_argument("file", nargs="?", help="Shopify CSV (standard: profilens output)")
+    parser.add_argument("--profile", help="butiksprofil vars output ska kontrolleras")
+    parser.add_argument("--rules", help=f"kommaseparerade regler (standard: alla: {', '.join(VALIDATION_RULES)})")
+    parser.add_argument("--report", help="spara rapporten som JSON till denna fil")
+    parser.add_argument("--delimiter", help="CSV-avgränsare (standard: känns av från filen)")
+    return parser
+
+
+def validate(argv):
+    parser = build_validate_parser()
+    args = parser.parse_args(argv)
+    path = args.file or (load_profile(args.profile).output if args.profile else None)
+    if not path:
+        parser.error("ange en fil eller --profile")
+    rules = make_rules(args.rules.split(',') if args.rules else None)
+    report = validate_shopify_csv(path, rules, args.delimiter)
+    print_validation_report(report)
+    if args.report:
+        write_validation_report(report, args.report)
+    return report
+
+
+def convert_all(argv):
+    args = build_batch_parser().parse_args(argv)
+    profile = load_profile(args.profile) if args.profile else None
+    delimiter = args.delimiter or (profile.delimiter if profile else None)
+    return convert_directory(args.directory, profile=profile, delimiter=delimiter,
+                             streaming=args.streaming, jobs=args.jobs)
+
+
+# Flaggor på kommandoraden går före profilens värden
+def convert_store(profile, args, executor=None):
+    input_file = args.input or profile.input
+    output_file = args.output or profile.output
+    if not input_file or not (output_file or args.plan_only):
+        raise ValueError(f"❌ {profile.name}: input och output måste anges i profilen eller med --input/--output")
+
+    delimiter = args.delimiter or profile.delimiter
+    existing_handles_file = args.existing_handles or profile.existing_handles
+    existing_handles = load_existing_handles(existing_handles_file) if existing_handles_file else ()
+    replacements = image_replacements(load_image_manifest(args.image_manifest), args.missing_image) if args.image_manifest else None
+
+    # Mappningen väljs från headern när filen öppnas
+    return replace_header_and_transform_data(input_file, output_file, delimiter=delimiter, max_rows=args.max_rows,
+                                             streaming=args.streaming, workers=args.workers,
+                                             metrics_file=args.metrics or profile.metrics,
+                                             state_file=args.state or profile.state,
+                                             existing_handles=existing_handles, profile=profile, executor=executor,
+                                             catalog_dir=args.catalog or profile.catalog,
+                                             invalid_file=args.invalid_report, image_replacements=replacements,
+                                             validate=not args.no_validate, validation_file=args.validation_report,
+                                             split_plan_file=args.split_plan, plan_only=args.plan_only)
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else list(argv)
+    if argv[:1] == ['convert-all']:
+        return convert_all(argv[1:])
+    if argv[:1] == ['catalog-csv']:
+        args = build_catalog_parser().parse_args(argv[1:])
+        return catalog_to_csv(args.catalog, args.output, args.delimiter)
+    if argv[:1] == ['validate']:
+        return validate(argv[1:])
+    if argv[:1] == ['check-images']:
+        args = build_images_parser().parse_args(argv[1:])
+        return check_export_images(args.input, args.mirror, args.manifest, args.delimiter, args.threads)
+
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    profiles = [load_profile(path) for path in args.profiles]
+
+    if len(profiles) > 1:
+        given = [f"--{name.replace('_', '-')}" for name in SINGLE_STORE_OPTIONS if getattr(args, name)]
+        if given:
+            parser.error(f"{', '.join(given)} kan bara användas med en profil")
+
+    executor = ProcessPoolExecutor(max_workers=args.workers) if args.workers > 1 else None
+    try:
+        for profile in profiles:
+            print(f"🏪 {profile.name}")
+            convert_store(profile, args, executor)
+    finally:
+        if executor is not None:
+            executor.shutdown()
@@ -0,0 +1,151 @@
+import csv
+from collections import defaultdict
+from operator import itemgetter
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+###################################################################
+# Typkonvertering kolumnvis (pris, lager, vikt, flaggor)
+#
+# I stället för att konvertera per fält och rad konverteras en hel
+# kolumn för en batch rader åt gången (coerce_rows), och varje unikt
+# värde i kolumnen tolkas bara en gång. Med NumPy tolkas de unika talen
+# i ett svep; utan NumPy, eller om svepet stöter på något som kräver
+# normalisering eller är ogiltigt, tolkas de ett och ett i Python med
+# samma resultat.
+#   float   priser                      '199' → 199.0
+#   int     lager                       '5'   → 5
+#   grams   vikt i kg → heltal gram     '0,8' → 800
+#   bool    flaggor                     'TRUE'/'1'/'yes' → True, annars False
+# Decimalkomma ('199,50') och mellanslag som tusentalsavgränsare
+# ('1 299') accepteras. Tomma celler blir 0 som förut; ogiltiga celler
+# blir också 0 men samlas i metrics.invalid_cells och redovisas samlat
+# i slutet av körningen (report_invalid_cells).
+###################################################################
+FLOAT, INT, GRAMS, BOOL = 'float', 'int', 'grams', 'bool'
+TRUE_VALUES = frozenset(('true', '1', 'yes'))
+NUMPY_TYPES = {FLOAT: 'float64', INT: 'int64', GRAMS: 'float64'}
+INT64_LIMIT = 2.0 ** 63
+
+def coerce_kind(field, data_type):
+    if field == 'Weight value (grams)':
+        return GRAMS
+    return {float: FLOAT, int: INT, bool: BOOL}[data_type]
+
+
+# Svensk notation → Pythons: decimalkomma och mellanslag som tusentalsavgränsare
+def normalize_number(value):
+    value = value.strip()
+    if ',' in value and '.' not in value and value.count(',') == 1:
+        value = value.replace(',', '.')
+    if ' ' in value or '\xa0' in value:
+        value = value.replace(' ', '').replace('\xa0', '')
+    return value
+
+
+def parse_float(value):
+    return float(value)
+
+def parse_int(value):
+    return int(value)
+
+def parse_grams(value):
+    return int(float(value) * 1000)
+
+PARSERS = {FLOAT: parse_float, INT: parse_int, GRAMS: parse_grams}
+
+
+# Alla värden i NumPy i ett svep; None om något värde inte går att tolka direkt
+def parse_numpy(texts, kind):
+    column = np.array(texts)
+    column[column == ''] = '0'
+    try:
+        numbers = column.astype(NUMPY_TYPES[kind])
+    except (ValueError, OverflowError):
+        return None
+    if kind == GRAMS:
+        numbers = numbers * 1000
+        # nan, inf och tal utanför int64 tolkas i Python (ogiltiga respektive exakta)
+        if not (np.isfinite(numbers).all() and (np.abs(numbers) < INT64_LIMIT).all()):
+            return None
+        numbers = numbers.astype('int64')
+    return numbers.tolist()
+
+
+# Tolka en lista med unika värden. Ger (värde → resultat, mängd med ogiltiga värden).
+def parse_values(texts, kind, use_numpy=np is not None):
+    if kind == BOOL:
+        return {text: text.lower() in TRUE_VALUES for text in texts}, set()
+
+    if use_numpy and texts:
+        numbers = parse_numpy(texts, kind)
+        if numbers is not None:
+            return dict(zip(texts, numbers)), set()
+
+    # Vanliga värden tolkas direkt; decimalkomma m.m. först efter normalize_number
+    parse = PARSERS[kind]
+    zero = 0.0 if kind == FLOAT else 0
+    parsed, invalid = {}, set()
+    for text in texts:
+        try:
+            parsed[text] = parse(text) if text else zero
+        except (ValueError, OverflowError):
+            normalized = normalize_number(text)
+            try:
+                parsed[text] = parse(normalized) if normalized else zero
+            except (ValueError, OverflowError):
+                parsed[text] = zero
+                invalid.add(text)
+    return parsed, invalid
+
+
+# Konvertera en kolumn (lista med strängar). Priser, vikter och flaggor upprepas
+# mellan varianterna, så varje unikt värde tolkas bara en gång.
+# Ger (värden, index för ogiltiga celler).
+def coerce_column(values, kind, use_numpy=np is not None):
+    parsed, invalid = parse_values(list(set(values)), kind, use_numpy)
+    result = list(map(parsed.__getitem__, values))
+    if not invalid:
+        return result, []
+    return result, [i for i, value in enumerate(values) if value in invalid]
+
+
+# Konvertera de typade kolumnerna för en batch ShopifyRows på plats.
+# Ogiltiga celler räknas och sparas i metrics (kolumn, värde, SKU, titel).
+def coerce_rows(rows, compiled, metrics, use_numpy=np is not None):
+    if not rows:
+        return
+    sku, title = compiled.columns['SKU'], compiled.columns['Title']
+    value_lists = [row.values for row in rows]
+    for column, kind in compiled.typed_columns:
+        converted, invalid = coerce_column(list(map(itemgetter(column), value_lists)), kind, use_numpy)
+        for i in invalid:
+            values = value_lists[i]
+            metrics.invalid_cells.append((compiled.header[column], values[column], values[sku], values[title]))
+            metrics.count('invalid_cells', compiled.header[column])
+        for values, value in zip(value_lists, converted):
+            values[column] = value
+
+
+# Sammanfattning av ogiltiga celler; med path skrivs alla till en CSV
+def report_invalid_cells(metrics, path=None):
+    if not metrics.invalid_cells:
+        return
+    by_column = defaultdict(list)
+    for field, value, sku, title in metrics.invalid_cells:
+        by_column[field].append(value)
+
+    print(f"⚠️ {len(metrics.invalid_cells)} ogiltiga värden har satts till 0:")
+    for field, values in by_column.items():
+        examples = ', '.join(repr(value) for value in list(dict.fromkeys(values))[:3])
+        print(f"   {field}: {len(values)} st (t.ex. {examples})")
+
+    if path:
+        with open(path, 'w', encoding='utf-8-sig', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(['Column', 'Value', 'SKU', 'Title'])
+            writer.writerows(metrics.invalid_cells)
+        print(f"📝 Ogiltiga värden sparade: {path}")
@@ -0,0 +1,1278 @@
+import os
+import io
+import csv
+import sys
+import time
+import json
+import hashlib
+from array import array
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
+from itertools import repeat
+
+from .catalog import CatalogWriter
+from .coerce import coerce_kind, coerce_rows, report_invalid_cells
+from .csvinput import open_csv_input, parse_csv_record, read_text_range, record_body
+from .handles import HandleRegistry, handle_from_title
+from .metrics import ConversionMetrics, timed_sanitize
+from .profiles import StoreProfile
+from .images import ImageRegistry
+from .splitting import MAX_OPTION_VALUES, MAX_VARIANTS, VariantSplitter, report_split_plan, splitter_for_profile
+from .text import clean_value, extract_categories, sanitize_html
+from .validate import RowValidator, report_violations
+
+csv.field_size_limit(sys.maxsize)
+
+##################
+##### SETUP ######
+##################
+# Define expected data types for each column
+expected_data_types = {
+    'Price': float,
+    'Price / International': float,
+    'Compare-at price': float,
+    'Compare-at price / International': float,
+    'Cost per item': float,
+    'Charge tax': bool,
+    'Inventory quantity': int,
+    'Weight value (grams)': int,
+    'Requires shipping': bool,
+    'Gift card': bool,
+    'Continue selling when out of stock': bool,
+}
+
+# Define the order of columns for the output CSV
+SHOPIFY_COLUMNS = [
+    "Title", "URL handle", "Description", "Vendor", "Product category", "Type", "Tags", "Published on online store",
+    "Status", "SKU", "Barcode", "Option1 name", "Option1 value", "Option2 name", "Option2 value", "Option3 name",
+    "Option3 value", "Price", "Price / International", "Compare-at price", "Compare-at price / International",
+    "Cost per item", "Charge tax", "Tax code", "Inventory policy", "Inventory quantity", "Continue selling when out of stock",
+    "Weight value (grams)", "Weight unit for display", "Requires shipping", "Fulfillment service", "Product image URL",
+    "Image position", "Image alt text", "Variant image URL", "Gift card", "SEO title", "SEO description",
+    "Google Shopping / Google product category", "Google Shopping / Gender", "Google Shopping / Age group",
+    "Google Shopping / MPN", "Google Shopping / AdWords Grouping", "Google Shopping / AdWords labels",
+    "Google Shopping / Condition", "Google Shopping / Custom product", "Google Shopping / Custom label 0",
+    "Google Shopping / Custom label 1", "Google Shopping / Custom label 2", "Google Shopping / Custom label 3",
+    "Google Shopping / Custom label 4", "Variant Inventory Tracker"
+]
+
+
+# Radtyp för räknarna: simple / variable / variation / other
+def row_kind(product_type):
+    if is_variant(product_type):
+        return 'variation'
+    if "variable" in product_type:
+        return 'variable'
+    if "simple" in product_type:
+        return 'simple'
+    return 'other'
+
+#################
+# Function to determine if a row represents a main product
+#################
+
+# product_type är Woo-kolumnen "Typ"/"Type", trimmad och i gemener
+def is_main_product(product_type):
+    return "simple" in product_type or "variable" in product_type
+
+def is_variant(product_type):
+    return "variation" in product_type
+
+
+#####################################################
+# Kolumnklasser för de mappade Shopify-fälten (gäller båda mappningarna nedan).
+# Varje klass får sin egen transformkedja i field_transforms – bara fritext
+# går genom sanitize_html. Fält som inte finns här räknas som fritext.
+#####################################################
+TEXT, NUMERIC, BOOLEAN, URL_LIST = 'text', 'numeric', 'boolean', 'url_list'
+
+column_policy = {
+    'Title': TEXT,
+    'Description': TEXT,
+    'SEO description': TEXT,
+    'SKU': TEXT,
+    'Barcode': TEXT,
+    'Status': TEXT,
+    'Tax code': TEXT,
+    'Shipping Category': TEXT,
+    'Option1 name': TEXT,
+    'Option1 value': TEXT,
+    'Option2 name': TEXT,
+    'Option2 value': TEXT,
+    'Option3 name': TEXT,
+    'Option3 value': TEXT,
+    'Weight value (grams)': NUMERIC,
+    'Inventory quantity': NUMERIC,
+    'Price': NUMERIC,
+    'Compare-at price': NUMERIC,
+    'Charge tax': BOOLEAN,
+    'Published on online store': BOOLEAN,
+    'Product image URL': URL_LIST,
+}
+
+
+#####################################################
+# Function to choose mapping based on the input file
+#####################################################
+def choose_mapping_from_file(csv_path, delimiter=None):
+    with open_csv_input(csv_path, delimiter) as source:
+        return choose_mapping(source.fieldnames)
+
+
+# Woo-exporter har alltid produkttyp och namn; Shopify-filer (Type + Title) har inte Namn/Name
+WOO_TYPE_COLUMNS = ('Typ', 'Type')
+WOO_NAME_COLUMNS = ('Namn', 'Name')
+
+def is_woo_export(headers):
+    return any(h in headers for h in WOO_TYPE_COLUMNS) and any(h in headers for h in WOO_NAME_COLUMNS)
+
+
+# Välj mapping utifrån en redan inläst header
+def choose_mapping(headers):
+    # Svensk mapping
+    mapping_sv = {
+        'Namn': 'Title',
+        'Beskrivning': 'Description',
+        'Artikelnummer': 'SKU',
+        'Vikt (kg)': 'Weight value (grams)',
+        'Lager': 'Inventory quantity',
+        'Ordinarie pris': 'Price',
+        'Reapris': 'Compare-at price',
+        'Bilder': 'Product image URL',
+        'Synlighet i katalog': 'Status',
+        'Kort beskrivning': 'SEO description',
+        'Momsstatus': 'Charge tax',
+        'Momsklass': 'Tax code',
+        'Fraktklass': 'Shipping Category',
+        'GTIN, UPC, EAN eller ISBN': 'Barcode',
+        'Attribut 1 namn': 'Option1 name',
+        'Attribut 1 värde(n)': 'Option1 value',
+        'Attribut 2 namn': 'Option2 name',
+        'Attribut 2 värde(n)': 'Option2 value',
+        'Attribut 3 namn': 'Option3 name',
+        'Attribut 3 värde(n)': 'Option3 value',
+        'Publicerad': 'Published on online store'
+    }
+
+    # Engelsk mapping
+    mapping_en = {
+        'Name': 'Title',
+        'Description': 'Description',
+        'SKU': 'SKU',
+        'Weight (kg)': 'Weight value (grams)',
+        'Stock': 'Inventory quantity',
+        'Regular price': 'Price',
+        'Sale price': 'Compare-at price',
+        'Images': 'Product image URL',
+        'Visibility in catalog': 'Status',
+        'Short description': 'SEO description',
+        'Tax status': 'Charge tax',
+        'Tax class': 'Tax code',
+        'Shipping class': 'Shipping Category',
+    }
+
+    if any(h in headers for h in mapping_sv.keys()):
+        print("📘 Mapping: Svenska fält identifierade")
+        return mapping_sv
+    elif any(h in headers for h in mapping_en.keys()):
+        print("📙 Mapping: Engelska fält identifierade")
+        return mapping_en
+    else:
+        raise ValueError("❌ Kunde inte identifiera lämplig mapping baserat på kolumnrubriker.")
+
+
+variant_fields = [
+    "Compare-at price", "Inventory quantity", "Weight value (grams)", "Price",
+    "Fulfillment service", "Requires shipping", "Charge tax", "Weight unit for display",
+    'Option1 value', 'Option1 name', 'Option2 name', 'Option2 value', 'Option3 name', 'Option3 value'
+]
+
+# Produktfält som bara står på huvudraden; töms på variantraderna
+product_fields = ["Title", "Description", "Vendor", "Product category", "Type", "Tags"]
+
+# Mapping for Swedish option names to English
+option_name_mapping = {
+    'Attribut 1 namn': 'Option1 name',
+    'Attribut 1 värde(n)': 'Option1 value',
+    'Attribut 2 namn': 'Option2 name',
+    'Attribut 2 värde(n)': 'Option2 value',
+    'Attribut 3 namn': 'Option3 name',
+    'Attribut 3 värde(n)': 'Option3 value'
+}
+
+# Mapping for Swedish option values to English
+option_value_mapping = {
+    'Storlek': 'Size',
+    'Färg': 'Color',
+    'Antal': 'Quantity',
+    'Vikt': 'Weight',
+    'Material': 'Material',
+    'Märke': 'Brand',
+    'Typ': 'Type', 
+    'Modell': 'Model',
+    'Längd': 'Length',
+    'Bredd': 'Width',
+    'Höjd': 'Height',
+    'Diameter': 'Diameter',
+    'Volym': 'Volume',
+    'Storleksguide': 'Size guide',
+    'Färgkod': 'Color code',
+    'Färgnamn': 'Color name',
+    'Färggrupp': 'Color group',
+    'Färgtyp': 'Color type',
+    'Smak': 'Flavor',
+    'Stil': 'Style',
+    'Fotstorlek': 'Foot Size',
+    'Summa': 'Total',
+    'Swarovski': 'Crystal Type',
+    'Swarovski GG08': 'Crystal Type GG08',
+    'Swarovski SS10': 'Crystal Type SS10',
+    'Båge': 'Frame',
+    'Modell': 'Model',
+    'E-Logga': 'E-Logo',
+    'Midja': 'Waist',
+    'Rondin G9': 'Rondin G9',
+    'Spänne': 'Buckle',
+    'Top': 'Top',
+    'Vad': 'Calf',
+    'Swarovski SS16': 'Crystal Type SS16',
+    'Ben': 'Leg',
+    'Extra Storlek': 'Extra Size',
+    'Infinito läder Top': 'Infinito Leather Top',
+    'Sida': 'Side',
+    'Skaft': 'Shaft',
+    'Skal': 'Shell'
+    # Add more mappings as needed
+}
+
+##################
+##### PROCESS ####
+##################
+########################################################################
+#  Definiera fält som alltid måste finnas – med standardvärden om de saknas.
+#  Butiksspecifika värden (Vendor m.fl.) kommer från profilens "defaults".
+########################################################################
+required_fields = {
+    'URL handle': '',
+    'Vendor': '',
+    'Published on online store': '',
+    'Product category': '',
+    'Tags': '',
+    'Option1 name': '',
+    'Option1 value': '',
+    'Option2 name': '',
+    'Option2 value': '',
+    'Option3 name': '',
+    'Option3 value': '',
+    'Fulfillment service': 'manual',
+    'Requires shipping': 'TRUE',
+    'Inventory policy': '',
+    'Charge tax': 'TRUE',
+    'Gift card': 'FALSE',
+    'Weight unit for display': 'kg',
+    'Continue selling when out of stock': '',
+    'Inventory policy': '',
+    "Variant Inventory Tracker" : 'shopify'
+}
+
+DEFAULT_PROFILE = StoreProfile('default')
+
+# Butikens standardvärden ovanpå de gemensamma
+def store_required_fields(profile):
+    fields = dict(required_fields)
+    fields.update(profile.defaults)
+    return fields
+
+
+##############################################
+# Säkerställ att alla nödvändiga kolumner finns med i slutgiltiga headern
+##############################################
+def build_final_header(mapping, required=required_fields):
+    final_header = list(SHOPIFY_COLUMNS)
+    for required_field in required.keys():
+        if required_field not in final_header:
+            final_header.append(required_field)
+
+    for field in mapping.values():
+        if field not in final_header:
+            final_header.append(field)
+    return final_header
+
+
+##############################################
+#  Transformkedja för ett mappat fält (bestäms en gång per kolumn
+#  utifrån column_policy)
+##############################################
+def field_transforms(target, sanitize=sanitize_html, images=None):
+    policy = column_policy.get(target, TEXT)
+
+    # Tal och flaggor (även vikt kg → gram) tolkas kolumnvis av coerce_rows – bara trimning och "[]" → ""
+    if policy in (NUMERIC, BOOLEAN):
+        return [clean_value]
+
+    # Bildlistor: trimning och URL-kodning av varje bild (en gång per unik cell i bildregistret)
+    if policy == URL_LIST:
+        if images is None:
+            images = ImageRegistry()
+        return [clean_value, images.quote_cell]
+
+    # Fritext: sanera HTML och escapa radbrytningar + citattecken, rensa sedan värdet (ex: ta bort "[]")
+    return [str.strip, sanitize, clean_value]
+
+
+def apply_transforms(value, transforms):
+    for transform in transforms:
+        value = transform(value)
+    return value
+
+
+##################################################################
+#  En Shopify-rad: värdena ligger i en lista i final_header-ordning.
+#  columns (fält → index) delas av alla rader från samma mappning,
+#  så en rad kostar en lista i stället för en dict med ~55 nycklar.
+#  source är radnumret i Woo-exporten (för valideringens felrapport).
+##################################################################
+class ShopifyRow:
+    __slots__ = ('columns', 'values', 'source')
+
+    def __init__(self, columns, values=None, source=None):
+        self.columns = columns
+        self.values = values if values is not None else [''] * len(columns)
+        self.source = source
+
+    def __getitem__(self, field):
+        return self.values[self.columns[field]]
+
+    def __setitem__(self, field, value):
+        self.values[self.columns[field]] = value
+
+    def get(self, field, default=''):
+        index = self.columns.get(field)
+        return self.values[index] if index is not None else default
+
+    def copy(self):
+        return ShopifyRow(self.columns, self.values[:], self.source)
+
+
+##################################################################
+#  Mappningen kompileras mot inputfilens header när den lästs in:
+#  fields = [(källindex, index i final_header, [transformfunktioner]), ...]
+#  Raderna läses sedan som listor från csv.reader i stället för dicts.
+##################################################################
+class CompiledMapping:
+    def __init__(self, fieldnames, mapping, metrics=None, profile=DEFAULT_PROFILE, image_replacements=None):
+        # Sista förekomsten vinner vid dubbla kolumnnamn, precis som i csv.DictReader
+        index = {name: i for i, name in enumerate(fieldnames)}
+        required = store_required_fields(profile)
+        self.fieldnames = fieldnames
+        self.index = index
+        self.header = build_final_header(mapping, required)
+        self.columns = columns = {name: i for i, name in enumerate(self.header)}
+        sanitize = timed_sanitize(metrics) if metrics is not None and metrics.sanitize_timing else sanitize_html
+        self.images = ImageRegistry(image_replacements)
+        self.fields = [
+            (i, columns[mapping[name]], field_transforms(mapping[name], sanitize, self.images))
+            for i, name in enumerate(fieldnames) if name in mapping
+        ]
+        self.key_fields = [field for field in self.fields if self.header[field[1]] in ('Title', 'SKU')]
+        self.options = [(index.get(swedish_option), columns[english_option]) for swedish_option, english_option in option_name_mapping.items()]
+        self.required = [(columns[field], default_value) for field, default_value in required.items()]
+
+        # Datatyper konverteras (coerce_rows) bara för fält som transform_row faktiskt sätter
+        assigned = {self.header[column] for _, column, _ in self.fields}
+        assigned.update(option_name_mapping.values(), required, ('Product category', 'Tags', 'Inventory policy', 'Status'))
+        self.typed_columns = [(columns[field], coerce_kind(field, data_type))
+                              for field, data_type in expected_data_types.items() if field in assigned]
+        self.type_columns = [index[name] for name in ('Typ', 'Type') if name in index]
+        self.category_columns = [index[name] for name in profile.category_columns if name in index]
+        self.restock_columns = [index[name] for name in ('Tillåt restnoteringar?', 'Backorders allowed?') if name in index]
+        self.visibility_columns = [index[name] for name in ('Visibility in catalog', 'Synlighet i katalog') if name in index]
+
+    def product_type(self, row):
+        for i in self.type_columns:
+            if row[i]:
+                return row[i].strip().lower()
+        return ""
+
+    def new_row(self):
+        return ShopifyRow(self.columns)
+
+    # Bara titel och SKU – det grupperingen behöver i första passet
+    def key_row(self, row):
+        new_row = self.new_row()
+        for index, column, transforms in self.key_fields:
+            new_row.values[column] = apply_transforms(row[index], transforms)
+        return new_row
+
+
+###############################################################
+#  Transformera en inläst Woo-rad (lista) till en ShopifyRow.
+#  Tal och flaggor är fortfarande text; de konverteras kolumnvis
+#  för en batch rader med coerce_rows innan raderna skrivs.
+###############################################################
+def transform_row(row, compiled):
+    new_row = compiled.new_row()
+    values = new_row.values
+
+    ##############################################
+    #  Mappa fält från input → Shopify-fält + gör ev. konvertering
+    ##############################################
+    for index, column, transforms in compiled.fields:
+        value = row[index]
+        for transform in transforms:
+            value = transform(value)
+        values[column] = value
+
+    ##################################################
+    #  Hämta attributnamn/värde (om svenska fält finns)
+    #  och översätt svenska attributnamn/värden till engelska
+    ##################################################
+    for index, column in compiled.options:
+        value = row[index].strip() if index is not None else ''
+        values[column] = option_value_mapping.get(value, value)
+
+    ##########################################
+    #  Extrahera produktkategori + skapa taggar
+    ##########################################
+    product_type, tags = extract_categories(
+        next((row[index] for index in compiled.category_columns if row[index]), "")
+    )
+    new_row["Product category"] = product_type
+    new_row["Tags"] = tags
+
+    ##################################################
+    # Sätt ifall den ska vara publiserad i store eller inte beroende på tidigare värde i "Publicerad"
+    ##################################################
+    pub_val = new_row['Published on online store']
+    if pub_val == '1':
+        new_row['Published on online store'] = 'TRUE'
+    elif pub_val == '-1':
+        new_row['Published on online store'] = 'FALSE'
+
+
+    ##########################################
+    #  Fyll i defaultvärden där det saknas
+    ##########################################
+    for column, default_value in compiled.required:
+        if not values[column]:
+            values[column] = default_value
+
+    ##############################################
+    # Fallback-värde för Inventory policy
+    ##############################################
+#    if "Inventory policy" not in new_row:
+#        new_row["Inventory policy"] = "shopify"
+
+    ########################################################################
+    # Hämta värde för restnoteringar från svenska eller engelska kolumnnamn #
+    ########################################################################
+    restock_value = ""
+    for index in compiled.restock_columns:
+        restock_value = row[index].strip().lower()
+        if restock_value:
+            break
+
+    # "Continue selling when out of stock" sätts alltid via required_fields (eller mappningen)
+
+    # Inventory policy sätts utifrån samma logik
+    if restock_value == "notify":
+        new_row["Inventory policy"] = "continue"
+    else:
+        new_row["Inventory policy"] = "continue"  # också fallback så det går att sälja
+
+
+    ##############################################
+    # Stöd för både engelska och svenska kolumnnamn för active/draft status ####
+    ##############################################
+    visibility = ""
+    for index in compiled.visibility_columns:
+        visibility = row[index].strip().lower()
+        if visibility:
+            break
+
+    if visibility == "visible":
+        new_row["Status"] = "active"
+    elif visibility in {"hidden", "search"}:
+        new_row["Status"] = "draft"
+    else:
+        new_row["Status"] = "draft"  # fallback om okänt värde
+
+    return new_row
+
+
+##################################################################
+#  Gruppering av varianter via Woo-kolumnerna "ID" och "Parent"
+#  Varianter pekar på sin förälder med "id:123" (eller förälderns SKU),
+#  så de kopplas i O(1) per rad utan att titeln behöver saneras.
+#  Saknar exporten Parent-kolumn används titelbaserade handles som förut.
+##################################################################
+PARENT_COLUMNS = ('Parent', 'Överordnad')
+
+class ParentIndex:
+    def __init__(self, compiled, metrics, handles=None):
+        index = compiled.index
+        self.metrics = metrics
+        self.handles = handles
+        parent_column = next((c for c in PARENT_COLUMNS if c in index), None)
+        self.compiled = compiled
+        self.by_id = parent_column is not None and 'ID' in index
+        self.id_index = index['ID'] if self.by_id else None
+        self.parent_index = index[parent_column] if self.by_id else None
+        self.sku_to_key = {}
+
+    def is_main(self, row):
+        return is_main_product(self.compiled.product_type(row))
+
+    # Det som grupperingen behöver från rå-raden: (typ, Woo-ID, Parent)
+    def row_refs(self, row):
+        if not self.by_id:
+            return self.compiled.product_type(row), '', ''
+        return self.compiled.product_type(row), row[self.id_index].strip(), row[self.parent_index].strip()
+
+    # Gruppnyckel för raden utan att reservera något handle, eller None om raden
+    # ska hoppas över. Huvudprodukter utan ID/Parent får sin nyckel i key_for_row.
+    def family_key(self, refs, new_row, i):
+        product_type, product_id, parent = refs
+        self.metrics.count('rows_in', row_kind(product_type))
+
+        if is_main_product(product_type):
+            sku = new_row.get('SKU', '').strip()
+            if sku and self.by_id and product_id:
+                self.sku_to_key.setdefault(sku, product_id)
+            return product_id
+
+        if is_variant(product_type):
+            if not new_row.get('SKU', '').strip():
+                print(f"❌ SKIPPING VARIANT WITHOUT SKU – {new_row.get('Title', '')} | {parent}")
+                self.metrics.count('skipped', 'variant_without_sku')
+                return None
+            if not self.by_id:
+                return handle_from_title(new_row.get('Title', ''))
+            if parent.startswith('id:'):
+                return parent[3:]
+            return self.sku_to_key.get(parent, parent)
+
+        print(f"⚠️ Skipping row {i+1} – Typ ej igenkänd: '{product_type}'")
+        self.metrics.count('skipped', 'unknown_type')
+        return None
+
+    # Returnerar (gruppnyckel, handle) för raden, eller (None, None) om raden ska hoppas över.
+    # Handle reserveras bara för huvudprodukter; varianter får None.
+    # En huvudprodukt med tomt ID grupperas på sitt handle, så att flera sådana
+    # inte hamnar i samma grupp och skriver över varandra.
+    def key_for_row(self, refs, new_row, i):
+        key = self.family_key(refs, new_row, i)
+        if key is None or not is_main_product(refs[0]):
+            return key, None
+        handle = self.handles.reserve(handle_from_title(new_row.get('Title', '')))
+        if self.by_id and not key:
+            key = f"handle:{handle}"
+            sku = new_row.get('SKU', '').strip()
+            if sku:
+                self.sku_to_key.setdefault(sku, key)
+        return (key if self.by_id else handle), handle
+
+
+##############################################
+#  Struktur för att lagra en produkt med dess varianter och bilder
+##############################################
+def new_product_group():
+    return {'main': None, 'handle': None, 'variants': [], 'images': ()}
+
+
+# handle sätts för huvudprodukter, None för varianter.
+# Huvudproduktens bilder sparas som id:n i bildregistret (images).
+def add_row_to_group(group, handle, new_row, metrics, images):
+    if handle is not None:
+        new_row['URL handle'] = handle
+        group['main'] = new_row
+        group['handle'] = handle
+        group['images'] = images.image_ids(new_row.get('Product image URL', ''))
+        return
+
+    sku = new_row.get('SKU', '').strip()
+    opt1 = new_row.get('Option1 value', '').strip()
+    opt2 = new_row.get('Option2 value', '').strip()
+    opt3 = new_row.get('Option3 value', '').strip()
+
+    if not any([opt1, opt2, opt3]):
+        group['variants'].append(new_row)
+        return
+
+    key = (opt1 or "N/A", opt2 or "N/A", opt3 or "N/A", sku)
+
+    if key not in group.setdefault('seen_keys', set()):
+        group['variants'].append(new_row)
+        group['seen_keys'].add(key)
+    else:
+        print(f"❗ SKIPPING DUPLICATE during READ – {group['handle'] or new_row.get('Title', '')} | {opt1 or 'N/A'}, {opt2 or 'N/A'}, {opt3 or 'N/A'} | SKU: {sku}")
+        metrics.count('skipped', 'duplicate_variant')
+
+##################
+##### WRITE ######
+##################
+# Index i Shopify-headern för fälten som skrivs om per rad i write_product_group.
+# Räknas ut en gång per writer i stället för att slås upp per fält och rad.
+class RowLayout:
+    def __init__(self, header):
+        columns = {name: i for i, name in enumerate(header)}
+        self.width = len(header)
+        self.handle = columns['URL handle']
+        self.title = columns['Title']
+        self.image = columns['Product image URL']
+        self.variant_image = columns['Variant image URL']
+        # Fält som huvudraden i varje del tar från delens första variant
+        self.from_variant = sorted({columns[field] for field in variant_fields})
+        self.product = [columns[field] for field in product_fields]
+
+
+# csv.writer med Shopify-headern. Raderna skrivs per sort (huvudrad, bild, variant)
+# så att en katalogfil (catalog.CatalogWriter) kan fyllas i samma pass.
+# images är bildregistret som produktgruppernas bild-id:n hör till.
+# validator (validate.RowValidator) kontrollerar varje rad när den skrivs;
+# source är Woo-raden som raden kommer från.
+# Ingen mottagare behåller radlistan efter anropet (csv.writer, katalogen och
+# valideringen läser bara cellerna), så raderna kan skrivas från delade listor.
+class ShopifyWriter:
+    def __init__(self, outfile, header, delimiter=',', catalog=None, images=None, validator=None):
+        self.writer = csv.writer(outfile, delimiter=delimiter, quoting=csv.QUOTE_ALL)
+        self.writer.writerow(header)
+        self.layout = RowLayout(header)
+        self.image_values = [''] * self.layout.width  # delad bildrad: bara handle och bild-URL
+        self.catalog = catalog
+        self.images = images if images is not None else ImageRegistry()
+        self.validator = validator
+        if catalog is not None:
+            catalog.start(header, delimiter)
+        if validator is not None:
+            validator.start(header)
+
+    def product(self, row):
+        self.writer.writerow(row.values)
+        if self.validator is not None:
+            self.validator.check(row.values, row.source)
+        if self.catalog is not None:
+            self.catalog.product(row.values)
+
+    def image(self, handle, image, source=None):
+        values = self.image_values
+        values[self.layout.handle] = handle
+        values[self.layout.image] = image
+        self.writer.writerow(values)
+        if self.validator is not None:
+            self.validator.check(values, source)
+        if self.catalog is not None:
+            self.catalog.image(handle, image)
+
+    # Extra bildrader för bild-id:n i registret
+    def image_rows(self, handle, image_ids, source=None):
+        for image_id in image_ids:
+            self.image(handle, self.images.url(image_id), source)
+
+    def variant(self, row):
+        self.writer.writerow(row.values)
+        if self.validator is not None:
+            self.validator.check(row.values, row.source)
+        if self.catalog is not None:
+            self.catalog.variant(row.values)
+
+
+def shopify_writer(outfile, header, delimiter=',', catalog=None, images=None, validator=None):
+    return ShopifyWriter(outfile, header, delimiter, catalog, images, validator)
+
+
+# Skriv en färdig produktgrupp (huvudprodukt + varianter + bilder).
+# Returnerar de handles som skrevs ut för gruppen. previous_handles är de handles
+# som familjen skrev förra gången (inkrementellt läge); del N återanvänder då
+# handle nummer N och bara nya delar reserverar ett handle.
+# Huvudraden är mall för alla delar: i stället för en kopia per del skrivs
+# bara fälten som skiljer delarna åt (variantfälten från delens första variant,
+# handle och titel) om i samma lista, och resten av cellerna delas.
+def write_product_group(writer, data, metrics, handles, splitter, previous_handles=()):
+    if not data['main']:
+        metrics.count('skipped', 'variation_without_parent', len(data['variants']))
+        return []
+
+    start = time.perf_counter()
+    handle = data['handle']
+    emitted = []
+    main_product = data['main']
+    variants = data['variants'][:]
+    registry = writer.images
+    layout = writer.layout
+    images = data['images']  # bild-id:n i registry
+    first_image = registry.url(images[0]) if images else ''
+
+    # Poppa första variant till huvudprodukt
+    if variants:
+        first_variant = variants.pop(0)
+        for field in variant_fields:
+            main_product[field] = first_variant[field]
+        main_product['Variant image URL'] = registry.first_url(first_variant['Product image URL'])
+
+    # Dela upp varianterna i grupper och delar om högst max_variants (splitting.py)
+    parts = splitter.split(handle, variants)
+
+    chunked = time.perf_counter()
+    metrics.add_time('chunk', chunked - start)
+
+    main_values = main_product.values
+    title = main_values[layout.title]
+    if parts and images:
+        main_values[layout.image] = first_image
+        main_values[layout.variant_image] = first_image
+    for number, part in enumerate(parts):
+        chunk = part.variants
+        if number < len(previous_handles):
+            new_handle = previous_handles[number]
+        else:
+            new_handle = handles.reserve(part.base_handle(handle))
+        emitted.append(new_handle)
+
+        first_chunk_values = chunk.pop(0).values
+        for i in layout.from_variant:
+            main_values[i] = first_chunk_values[i]
+        main_values[layout.handle] = new_handle
+        main_values[layout.title] = part.title(title)
+        writer.product(main_product)
+        metrics.count('rows_out', 'variable')
+
+        writer.image_rows(new_handle, images[1:], main_product.source)
+        metrics.count('rows_out', 'image', len(images[1:]))
+
+        for var in chunk:
+            values = var.values
+            values[layout.handle] = new_handle
+            if values[layout.image]:
+                values[layout.variant_image] = registry.first_url(values[layout.image])
+            elif images:
+                values[layout.variant_image] = first_image
+            for i in layout.product:
+                values[i] = ''
+            writer.variant(var)
+        metrics.count('rows_out', 'variation', len(chunk))
+
+    # Produkter utan varianter
+    if not data['variants'] and not parts:
+        unique_main_handle = previous_handles[0] if previous_handles else handles.reserve(handle)
+        emitted.append(unique_main_handle)
+        main_product['URL handle'] = unique_main_handle
+        if images:
+            main_product['Product image URL'] = first_image
+            main_product['Variant image URL'] = first_image
+        writer.product(main_product)
+        metrics.count('rows_out', 'simple')
+        writer.image_rows(unique_main_handle, images[1:], main_product.source)
+        metrics.count('rows_out', 'image', len(images[1:]))
+
+    metrics.add_time('write', time.perf_counter() - chunked)
+    return emitted
+
+
+#########################################################
+##### STREAMING: radindex i stället för hela katalogen ###
+#########################################################
+# Läs rader från csv.reader och mät tiden som går åt till själva läsningen.
+# Tomma rader hoppas över, precis som i csv.DictReader.
+def timed_rows(reader, metrics):
+    while True:
+        start = time.perf_counter()
+        row = next(reader, None)
+        metrics.phases['read'] += time.perf_counter() - start
+        if row is None:
+            return
+        if row:
+            yield row
+
+
+# Läs in och transformera en produktgrupp utifrån dess (offset, längd, radnummer)-tripplar
+def read_indexed_group(source, handle, offsets, compiled, parents, metrics):
+    group = new_product_group()
+    rows = []
+    for j in range(0, len(offsets), 3):
+        try:
+            start = time.perf_counter()
+            row = parse_csv_record(source.record(offsets[j], offsets[j + 1]), source.delimiter)
+            parsed = time.perf_counter()
+            new_row = transform_row(row, compiled)
+            new_row.source = offsets[j + 2]
+            mapped = time.perf_counter()
+            metrics.add_time('read', parsed - start)
+            metrics.add_time('map', mapped - parsed)
+        except Exception as e:
+            print(f"⚠️ Rad {offsets[j + 2]} kunde inte behandlas: {e}")
+            metrics.count('skipped', 'row_error')
+            continue
+        add_row_to_group(group, handle if parents.is_main(row) else None, new_row, metrics, compiled.images)
+        metrics.add_time('group', time.perf_counter() - mapped)
+        rows.append(new_row)
+
+    with metrics.phase('coerce'):
+        coerce_rows(rows, compiled, metrics)
+    return group
+
+
+# Tvåpassversion: första passet bygger bara ett index grupp → (offset, längd),
+# andra passet läser in en produktgrupp i taget och skriver den direkt.
+# Minnet skalar då med största produktfamiljen i stället för hela katalogen.
+def stream_transform_data(source, output_file, mapping, profile, metrics, handles, max_rows=None, catalog=None,
+                          image_replacements=None, validator=None, splitter=None):
+    delimiter = source.delimiter
+    records = source.records()
+    compiled = CompiledMapping(source.fieldnames, mapping, metrics, profile, image_replacements)
+    parents = ParentIndex(compiled, metrics, handles)
+
+    ##############################################
+    #  Pass 1: index grupp → [handle, array med offset/längd/radnummer per rad]
+    ##############################################
+    group_index = {}
+    for i, (offset, data) in enumerate(records):
+        try:
+            if max_rows is not None and i >= max_rows:
+                break
+
+            start = time.perf_counter()
+            row = parse_csv_record(data, delimiter)
+            parsed = time.perf_counter()
+            key_row = compiled.key_row(row)
+            mapped = time.perf_counter()
+            key, handle = parents.key_for_row(parents.row_refs(row), key_row, i)
+            metrics.add_time('read', parsed - start)
+            metrics.add_time('map', mapped - parsed)
+            metrics.add_time('group', time.perf_counter() - mapped)
+            if key is None:
+                continue
+            entry = group_index.get(key)
+            if entry is None:
+                entry = group_index[key] = [None, array('q')]
+            if handle is not None:
+                entry[0] = handle
+            entry[1].extend((offset, len(data), i + 1))
+
+        except Exception as e:
+            print(f"⚠️ Rad {i+1} kunde inte behandlas: {e}")
+            metrics.count('skipped', 'row_error')
+            continue
+
+    ##############################################
+    #  Pass 2: läs in en grupp i taget och skriv ut den
+    ##############################################
+    with open(output_file, 'w', encoding='utf-8-sig', newline='') as outfile:
+        writer = shopify_writer(outfile, compiled.header, delimiter, catalog, compiled.images, validator)
+        splitter = splitter or splitter_for_profile(profile, option_value_mapping)
+
+        for handle, offsets in group_index.values():
+            group = read_indexed_group(source, handle, offsets, compiled, parents, metrics)
+            write_product_group(writer, group, metrics, handles, splitter)
+
+    print(f" Shopify CSV created successfully (streaming): {output_file} ({'ALL rows' if max_rows is None else f'first {max_rows} rows'})")
+
+
+#########################################################
+##### INKREMENTELL: skriv bara ändrade produktfamiljer ###
+#########################################################
+# Tillståndsfilen (JSON) håller per produktfamilj – nyckel = förälderns Woo-ID –
+# en hash av familjens källrader, familjens handle, de handles som skrevs ut
+# och varje rads ID/SKU → radhash. Nästa körning skriver bara ut nya och ändrade
+# familjer till en delta-CSV. Alla tidigare familjers handles reserveras från
+# tillståndet så att nya produkter aldrig krockar med dem; ändrade familjer
+# skriver om sina delar med samma handles som förra gången. Får en ändrad
+# familj färre delar sparas de överblivna handles som 'retired': de
+# redovisas som produkter att ta bort och förblir reserverade.
+STATE_VERSION = 1
+
+def load_conversion_state(state_file):
+    if not os.path.exists(state_file):
+        return {'version': STATE_VERSION, 'mapping': None, 'families': {}}
+    with open(state_file, 'r', encoding='utf-8') as f:
+        state = json.load(f)
+    if state.get('version') != STATE_VERSION:
+        raise ValueError(f"❌ Okänd version i tillståndsfilen {state_file}: {state.get('version')}")
+    return state
+
+
+# Skriv via en temporär fil så att en avbruten körning inte lämnar en halv tillståndsfil
+def save_conversion_state(state_file, state):
+    tmp_file = state_file + '.tmp'
+    with open(tmp_file, 'w', encoding='utf-8') as f:
+        json.dump(state, f, ensure_ascii=False)
+    os.replace(tmp_file, state_file)
+
+
+def content_hash(data):
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def incremental_transform_data(source, output_file, mapping, profile, metrics, handles, state_file, image_replacements=None,
+                               validator=None, splitter=None):
+    state = load_conversion_state(state_file)
+    previous = state['families']
+    delimiter, fieldnames = source.delimiter, source.fieldnames
+
+    records = source.records()
+    compiled = CompiledMapping(fieldnames, mapping, metrics, profile, image_replacements)
+    parents = ParentIndex(compiled, metrics, handles)
+    if not parents.by_id:
+        raise ValueError("❌ Inkrementell konvertering kräver kolumnerna ID och Parent/Överordnad i exporten")
+
+    # Ändrad mappning, kolumner eller butiksprofil ger en annan output för alla rader
+    settings = [fieldnames, mapping, profile.defaults, list(profile.category_columns)]
+    splits = [profile.variant_splits, profile.max_variants, profile.max_option_values, profile.pack_option]
+    if splits != [None, MAX_VARIANTS, MAX_OPTION_VALUES, None]:
+        settings.append(splits)
+    mapping_hash = content_hash(json.dumps(settings, ensure_ascii=False).encode('utf-8'))
+    if previous and state.get('mapping') != mapping_hash:
+        print("ℹ️ Mappningen, kolumnerna eller profilen har ändrats – alla produktfamiljer skrivs ut igen")
+        for entry in previous.values():
+            entry['hash'] = None
+
+    ##############################################
+    #  Pass 1: familj → [titel, offset/längd/radnummer, familjehash, {ID/SKU: radhash}]
+    ##############################################
+    families = {}
+    for i, (offset, data) in enumerate(records):
+        try:
+            start = time.perf_counter()
+            row = parse_csv_record(data, delimiter)
+            parsed = time.perf_counter()
+            key_row = compiled.key_row(row)
+            mapped = time.perf_counter()
+            refs = parents.row_refs(row)
+            key = parents.family_key(refs, key_row, i)
+            metrics.add_time('read', parsed - start)
+            metrics.add_time('map', mapped - parsed)
+            metrics.add_time('group', time.perf_counter() - mapped)
+            if key is None:
+                continue
+            # Utan ID (eller Parent för varianter) kan familjen inte följas mellan körningar
+            if not key:
+                print(f"⚠️ Skipping row {i+1} – saknar ID/Parent: {key_row.get('Title', '')}")
+                metrics.count('skipped', 'missing_id')
+                continue
+            entry = families.get(key)
+            if entry is None:
+                entry = families[key] = [None, array('q'), hashlib.blake2b(digest_size=16), {}]
+            if is_main_product(refs[0]):
+                entry[0] = key_row.get('Title', '')
+            entry[1].extend((offset, len(data), i + 1))
+            digest = hashlib.blake2b(record_body(data), digest_size=16)
+            entry[2].update(digest.digest())
+            entry[3][refs[1] or key_row.get('SKU', '').strip() or f"#{i+1}"] = digest.hexdigest()
+
+        except Exception as e:
+            print(f"⚠️ Rad {i+1} kunde inte behandlas: {e}")
+            metrics.count('skipped', 'row_error')
+            continue
+
+    ##############################################
+    #  Jämför med tillståndet och reservera handles
+    ##############################################
+    changed = {}
+    for key, entry in families.items():
+        old = previous.get(key)
+        family_hash = entry[2].hexdigest()
+        if old is None:
+            changed[key] = family_hash
+            metrics.count('families', 'new')
+        elif old.get('removed') or old['hash'] != family_hash:
+            changed[key] = family_hash
+            metrics.count('families', 'changed')
+        else:
+            metrics.count('families', 'unchanged')
+
+    # Alla familjer från förra körningen finns kvar i Shopify med sina handles.
+    # Ändrade familjer skriver om samma produkter, så deras handles reserveras också.
+    for key, old in previous.items():
+        handles.preload([old['handle']] + old['handles'] + old.get('retired', []))
+        if key not in families and not old.get('removed'):
+            print(f"🗑️ Finns inte längre i exporten (ta bort i Shopify): {', '.join(old['handles']) or key}")
+            metrics.count('families', 'removed')
+            old['removed'] = True
+
+    # Ändrade familjer behåller sitt handle även om titeln har ändrats;
+    # nya familjer får handles först när alla gamla är reserverade
+    reused = {}
+    previous_retired = {key: old.get('retired', []) for key, old in previous.items()}
+    for key in changed:
+        old = previous.get(key)
+        if old and old['handle']:
+            families[key][0] = old['handle']
+            reused[key] = old['handles'] + old.get('retired', [])
+    for key in changed:
+        entry = families[key]
+        if key not in reused and entry[0] is not None:
+            entry[0] = handles.reserve(handle_from_title(entry[0]))
+
+    ##############################################
+    #  Pass 2: skriv ut nya och ändrade familjer till delta-CSV:n
+    ##############################################
+    with open(output_file, 'w', encoding='utf-8-sig', newline='') as outfile:
+        writer = shopify_writer(outfile, compiled.header, delimiter, images=compiled.images, validator=validator)
+        splitter = splitter or splitter_for_profile(profile, option_value_mapping)
+
+        for key, (handle, offsets, _, rows) in families.items():
+            if key not in changed:
+                continue
+            group = read_indexed_group(source, handle, offsets, compiled, parents, metrics)
+            old_handles = reused.get(key, [])
+            emitted = write_product_group(writer, group, metrics, handles, splitter, old_handles)
+            previous[key] = {'hash': changed[key], 'handle': handle, 'handles': emitted, 'rows': rows}
+
+            # Delar som inte skrivs längre finns kvar i Shopify med gammalt innehåll
+            retired = old_handles[len(emitted):]
+            if retired:
+                previous[key]['retired'] = retired
+                already = set(previous_retired.get(key, ()))
+                newly_retired = [h for h in retired if h not in already]
+                if newly_retired:
+                    print(f"🗑️ Finns inte längre i exporten (ta bort i Shopify): {', '.join(newly_retired)}")
+                    metrics.count('handles', 'retired', len(newly_retired))
+
+    state['mapping'] = mapping_hash
+    save_conversion_state(state_file, state)
+
+    counts = metrics.counters['families']
+    print(f"🔁 Delta: {counts['new']} nya, {counts['changed']} ändrade, {counts['unchanged']} oförändrade, "
+          f"{counts['removed']} borttagna produktfamiljer")
+    print(f" Shopify delta CSV created successfully: {output_file} (tillstånd: {state_file})")
+
+
+#########################################################
+##### PARALLELL: transformera byte-intervall i flera processer ###
+#########################################################
+# Delar upp datat efter headern i ungefär lika stora byte-intervall som alltid
+# slutar på en postgräns. Returnerar [(start, slut), ...].
+def split_csv_chunks(source, chunk_count):
+    size = source.size()
+    step = max((size - source.data_start) // max(chunk_count, 1), 1)
+
+    chunks = []
+    chunk_start = source.data_start
+    for offset, data in source.records():
+        end = offset + len(data)
+        if end - chunk_start >= step:
+            chunks.append((chunk_start, end))
+            chunk_start = end
+    if chunk_start < size:
+        chunks.append((chunk_start, size))
+    return chunks
+
+
+# Körs i en arbetsprocess: transformerar alla rader i ett byte-intervall.
+# Ger en lista med (refs, new_row, fel) i filordning plus arbetsprocessens
+# metrics; grupperingen och handle-reserveringen görs sedan i huvudprocessen
+# i samma ordning som seriellt.
+def transform_chunk(input_file, start, end, fieldnames, mapping, profile, delimiter, image_replacements=None,
+                    sanitize_timing=False):
+    metrics = ConversionMetrics(sanitize_timing)
+    with metrics.phase('read'):
+        text = read_text_range(input_file, start, end)
+
+    compiled = CompiledMapping(fieldnames, mapping, metrics, profile, image_replacements)
+    parents = ParentIndex(compiled, metrics)
+    results = []
+    for row in timed_rows(csv.reader(io.StringIO(text, newline=None), delimiter=delimiter), metrics):
+        try:
+            with metrics.phase('map'):
+                results.append((parents.row_refs(row), transform_row(row, compiled), None))
+        except Exception as e:
+            results.append((None, None, str(e)))
+
+    with metrics.phase('coerce'):
+        coerce_rows([new_row for _, new_row, error in results if error is None], compiled, metrics)
+    return results, metrics
+
+
+# Fas-tiderna för read/map/sanitize summeras över alla arbetsprocesser (CPU-tid, inte väggklocka).
+# Med executor återanvänds en befintlig processpool (t.ex. en per CLI-körning för flera butiker).
+def parallel_transform_data(source, output_file, mapping, profile, metrics, handles, max_rows=None, workers=2, executor=None,
+                            catalog=None, image_replacements=None, validator=None, splitter=None):
+    chunks = split_csv_chunks(source, workers * 4)
+    fieldnames, delimiter = source.fieldnames, source.delimiter
+    compiled = CompiledMapping(fieldnames, mapping, profile=profile, image_replacements=image_replacements)
+    parents = ParentIndex(compiled, metrics, handles)
+    products = defaultdict(new_product_group)
+
+    def chunk_rows(results):
+        for rows, worker_metrics in results:
+            metrics.merge(worker_metrics)
+            yield from rows
+
+    with ProcessPoolExecutor(max_workers=workers) if executor is None else nullcontext(executor) as pool:
+        results = pool.map(
+            transform_chunk,
+            repeat(source.path), [start for start, _ in chunks], [end for _, end in chunks],
+            repeat(fieldnames), repeat(mapping), repeat(profile), repeat(delimiter), repeat(image_replacements),
+            repeat(metrics.sanitize_timing)
+        )
+
+        ##############################################
+        #  Slå ihop resultaten i filordning och gruppera per förälder
+        ##############################################
+        for i, (refs, new_row, error) in enumerate(chunk_rows(results)):
+            if max_rows is not None and i >= max_rows:
+                results.close()  # avbryter de intervall som inte har startat
+                break
+            if error is not None:
+                print(f"⚠️ Rad {i+1} kunde inte behandlas: {error}")
+                metrics.count('skipped', 'row_error')
+                continue
+
+            new_row.source = i + 1
+            with metrics.phase('group'):
+                key, handle = parents.key_for_row(refs, new_row, i)
+                if key is None:
+                    continue
+                add_row_to_group(products[key], handle, new_row, metrics, compiled.images)
+
+    write_products(output_file, products, compiled.header, metrics, handles, delimiter, catalog, compiled.images, validator,
+                   splitter or splitter_for_profile(profile, option_value_mapping))
+
+    print(f" Shopify CSV created successfully ({workers} workers): {output_file} ({'ALL rows' if max_rows is None else f'first {max_rows} rows'})")
+
+
+def write_products(output_file, products, header, metrics, handles, delimiter=',', catalog=None, images=None, validator=None,
+                   splitter=None):
+    splitter = splitter or VariantSplitter(option_names=option_value_mapping)
+    with open(output_file, 'w', encoding='utf-8-sig', newline='') as outfile:
+        writer = shopify_writer(outfile, header, delimiter, catalog, images, validator)
+
+        for data in products.values():
+            write_product_group(writer, data, metrics, handles, splitter)
+
+
+# Antal rader per typkonvertering i seriellt läge
+COERCE_BATCH = 8192
+
+def serial_transform_data(source, output_file, mapping, profile, metrics, handles, max_rows=None, catalog=None,
+                          image_replacements=None, validator=None, splitter=None):
+    ##################
+    ##### READ #######
+    ##################
+
+    #######################################################
+    #### Läs in inputfilen och starta rad-för-rad-processen ####
+    #######################################################
+    reader = source.rows()
+    fieldnames, delimiter = source.fieldnames, source.delimiter
+
+    ##############################################
+    # Kompilera mappningen mot kolumnerna som finns i input-filen
+    ##############################################
+    compiled = CompiledMapping(fieldnames, mapping, metrics, profile, image_replacements)
+    parents = ParentIndex(compiled, metrics, handles)
+
+    ##############################################
+    #  Initiera struktur för att lagra produkter efter Woo-ID (eller "handle")
+    ##############################################
+    products = defaultdict(new_product_group)
+    pending = []  # rader som väntar på typkonvertering, se coerce_rows
+
+    ###############################################################
+    #  Gå igenom varje rad i filen (en produkt eller variant per rad)
+    ###############################################################
+    for i, row in enumerate(timed_rows(reader, metrics)):
+        try:
+            if max_rows is not None and i >= max_rows:
+                break
+
+            start = time.perf_counter()
+            new_row = transform_row(row, compiled)
+            new_row.source = i + 1
+            mapped = time.perf_counter()
+            metrics.add_time('map', mapped - start)
+
+            key, handle = parents.key_for_row(parents.row_refs(row), new_row, i)
+            if key is not None:
+                add_row_to_group(products[key], handle, new_row, metrics, compiled.images)
+                pending.append(new_row)
+            metrics.add_time('group', time.perf_counter() - mapped)
+
+        except Exception as e:
+            print(f"⚠️ Rad {i+1} kunde inte behandlas: {e}")
+            metrics.count('skipped', 'row_error')
+            continue # ← här ska den vara – endast om det blir fel
+
+        if len(pending) >= COERCE_BATCH:
+            with metrics.phase('coerce'):
+                coerce_rows(pending, compiled, metrics)
+            pending = []
+
+    with metrics.phase('coerce'):
+        coerce_rows(pending, compiled, metrics)
+
+    ##################
+    ##### WRITE ######
+    ##################
+    write_products(output_file, products, compiled.header, metrics, handles, delimiter, catalog, compiled.images, validator,
+                   splitter or splitter_for_profile(profile, option_value_mapping))
+
+    print(f" Shopify CSV created successfully: {output_file} ({'ALL rows' if max_rows is None else f'first {max_rows} rows'})")
+
+
+# Function to replace header and transform data
+# Exporten öppnas en gång (csvinput); avgränsaren känns av om delimiter är None och
+# mappningen väljs från headern om mapping är None. Output skrivs med samma avgränsare.
+# Returnerar körningens ConversionMetrics; med metrics_file skrivs de även som JSON (och sanitize får egen tidtagning).
+# Med state_file körs konverteringen inkrementellt och output_file blir en delta-CSV.
+# existing_handles är handles som redan finns i butiken och inte får återanvändas.
+# profile är butiksprofilen (standardvärden, kategorikolumner); executor en delad processpool för workers > 1.
+# Ogiltiga tal sammanfattas i slutet; med invalid_file skrivs alla till en CSV.
+# Med catalog_dir sparas den konverterade katalogen även som Parquet-tabeller (kräver pyarrow, se catalog.py).
+# image_replacements (från ett bildmanifest, se media.py) tar bort eller byter ut saknade bilder.
+# Raderna valideras medan de skrivs (validate.py) om inte validate=False; fel sammanfattas
+# i slutet och med validation_file sparas hela rapporten som JSON.
+# Stora familjer delas upp enligt profilens variant_splits; med split_plan_file sparas planen som JSON.
+# Med plan_only räknas bara uppdelningsplanen ut (ingen CSV, katalog, validering eller tillstånd skrivs),
+# så att den kan granskas innan den riktiga konverteringen körs.
+# source är en redan öppnad CsvInput för input_file (t.ex. från convert-all); den stängs av anroparen.
+def replace_header_and_transform_data(input_file, output_file, mapping=None, delimiter=None, max_rows=None, streaming=False, workers=1,
+                                      metrics_file=None, state_file=None, existing_handles=(), profile=DEFAULT_PROFILE,
+                                      executor=None, catalog_dir=None, invalid_file=None, image_replacements=None,
+                                      validate=True, validation_file=None, split_plan_file=None, plan_only=False,
+                                      source=None):
+    if plan_only:
+        output_file, state_file, catalog_dir, validate = os.devnull, None, None, False
+    if streaming and workers > 1:
+        raise ValueError("❌ streaming och workers > 1 kan inte kombineras")
+    if state_file and (workers > 1 or max_rows is not None):
+        raise ValueError("❌ inkrementell körning (state) kan inte kombineras med workers > 1 eller max_rows")
+    if state_file and catalog_dir:
+        raise ValueError("❌ inkrementell körning (state) skriver bara en delta och kan inte kombineras med catalog")
+
+    metrics = ConversionMetrics(sanitize_timing=metrics_file is not None)
+    handles = HandleRegistry(metrics, existing_handles)
+    catalog = CatalogWriter(catalog_dir, product_fields, expected_data_types) if catalog_dir else None
+    validator = RowValidator() if validate else None
+    splitter = splitter_for_profile(profile, option_value_mapping)
+    with nullcontext(source) if source is not None else open_csv_input(input_file, delimiter) as source:
+        if mapping is None:
+            mapping = choose_mapping(source.fieldnames)
+        if state_file:
+            incremental_transform_data(source, output_file, mapping, profile, metrics, handles, state_file,
+                                       image_replacements=image_replacements, validator=validator, splitter=splitter)
+        elif streaming:
+            stream_transform_data(source, output_file, mapping, profile, metrics, handles, max_rows=max_rows, catalog=catalog,
+                                  image_replacements=image_replacements, validator=validator, splitter=splitter)
+        elif workers > 1:
+            parallel_transform_data(source, output_file, mapping, profile, metrics, handles, max_rows=max_rows, workers=workers,
+                                    executor=executor, catalog=catalog, image_replacements=image_replacements,
+                                    validator=validator, splitter=splitter)
+        else:
+            serial_transform_data(source, output_file, mapping, profile, metrics, handles, max_rows=max_rows, catalog=catalog,
+                                  image_replacements=image_replacements, validator=validator, splitter=splitter)
+    report_invalid_cells(metrics, invalid_file)
+    report_split_plan(splitter, metrics, split_plan_file)
+    if plan_only:
+        print("🧪 Bara uppdelningsplanen räknades ut – ingen Shopify-CSV skrevs")
+    if validator is not None:
+        report_violations(validator, metrics, output_file, validation_file)
+
+    if catalog is not None:
+        with metrics.phase('write'):
+            catalog.close()
+
+    if metrics_file:
+        metrics.write_json(metrics_file)
+    return metrics
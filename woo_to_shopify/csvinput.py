@@ -0,0 +1,193 @@
+import io
+import csv
+import mmap
+import codecs
+
+###################################################################
+# Inläsning av Woo-exporten
+#
+# Filen öppnas en gång binärt. Från början av filen känns BOM:ar av
+# (thsexport2.csv har två), headern läses och avgränsaren väljs från
+# headern om den inte anges. CsvInput ger sedan headern och läsare för
+# resten av filen utan att filen öppnas igen:
+#   rows()     csv.reader-rader (seriell konvertering)
+#   records()  (offset, data) per post (streaming/inkrementell/parallell)
+#   record()   en post via offset/längd (grupperingsindexet)
+# Filen minnesmappas (mmap) när det går: postgränserna hittas då i ett
+# svep med find() direkt i mappningen och data är memoryview-slices utan
+# kopiering. Tomma filer och filsystem utan mmap läses som vanligt.
+# Citattecken följer Woo/Excel: " med dubblerade "" inuti fält.
+###################################################################
+DELIMITERS = (',', ';', '\t', '|')
+SNIFF_SIZE = 64 * 1024
+
+# Delar upp en binärt öppnad CSV-fil i poster (respekterar radbrytningar
+# inom citattecken). Ger (offset, bytes) för varje post från filens position.
+def index_csv_records(raw_file):
+    offset = raw_file.tell()
+    start = offset
+    parts = []
+    quotes = 0
+    for line in raw_file:
+        parts.append(line)
+        quotes += line.count(b'"')
+        offset += len(line)
+        if quotes % 2:
+            continue  # citattecken öppet → posten fortsätter på nästa rad
+        data = b''.join(parts)
+        if data.strip(b'\r\n'):
+            yield start, data
+        parts = []
+        quotes = 0
+        start = offset
+    if parts and b''.join(parts).strip(b'\r\n'):
+        yield start, b''.join(parts)
+
+
+# Samma postgränser som index_csv_records, men direkt i en minnesmappad buffer:
+# ger (offset, längd) för varje post i buffer[start:end]. Citattecknen räknas
+# bara på rader som har något, så vanliga rader kostar ett enda find().
+def scan_records(buffer, start, end):
+    find = buffer.find
+    record_start = pos = start
+    quotes = 0
+    while pos < end:
+        newline = find(b'\n', pos, end)
+        line_end = end if newline < 0 else newline + 1
+        if find(b'"', pos, line_end) >= 0:
+            quotes += buffer[pos:line_end].count(b'"')
+        pos = line_end
+        if quotes % 2:
+            continue  # citattecken öppet → posten fortsätter på nästa rad
+        quotes = 0
+        if line_end - record_start > 2 or buffer[record_start:line_end].strip(b'\r\n'):
+            yield record_start, line_end - record_start
+        record_start = line_end
+    if record_start < end and buffer[record_start:end].strip(b'\r\n'):
+        yield record_start, end - record_start
+
+
+# Tolka en enskild post (bytes eller memoryview) på samma sätt som csv.reader på en textfil
+def parse_csv_record(data, delimiter, encoding='utf-8'):
+    text = io.StringIO(str(data, encoding), newline=None)
+    return next(csv.reader(text, delimiter=delimiter), [])
+
+
+# Posten utan avslutande radbrytning (för hashning), fungerar även för memoryview
+def record_body(data):
+    end = len(data)
+    while end and data[end - 1] in b'\r\n':
+        end -= 1
+    return data[:end]
+
+
+# Text för ett byte-intervall, t.ex. en arbetsprocess del av filen
+def read_text_range(path, start, end):
+    with open(path, 'rb') as raw:
+        try:
+            with mmap.mmap(raw.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                with memoryview(mapped) as view:
+                    return str(view[start:end], 'utf-8')
+        except (ValueError, OSError):
+            raw.seek(start)
+            return raw.read(end - start).decode('utf-8')
+
+
+# Antal BOM:ar i början av provet (Excel-exporter kan få flera)
+def count_boms(sample):
+    count = 0
+    while sample.startswith(codecs.BOM_UTF8, count * len(codecs.BOM_UTF8)):
+        count += 1
+    return count
+
+
+# Den avgränsare som förekommer flest gånger i headern utanför citattecken
+def sniff_delimiter(header_text):
+    unquoted = ''.join(header_text.split('"')[::2])
+    counts = [(unquoted.count(d), d) for d in DELIMITERS]
+    count, delimiter = max(counts, key=lambda pair: pair[0])
+    return delimiter if count else ','
+
+
+class CsvInput:
+    def __init__(self, path, delimiter=None):
+        self.path = path
+        self.raw = open(path, 'rb')
+        self.text = None
+        self.view = None
+        try:
+            sample = self.raw.read(SNIFF_SIZE)
+            self.boms = count_boms(sample)
+            self.raw.seek(self.boms * len(codecs.BOM_UTF8))
+            header_offset, header_data = next(index_csv_records(self.raw), (self.raw.tell(), b''))
+            self.delimiter = delimiter or sniff_delimiter(header_data.decode('utf-8'))
+            self.fieldnames = parse_csv_record(header_data, self.delimiter)
+            self.data_start = header_offset + len(header_data)
+            self.map_file()
+        except Exception:
+            self.raw.close()
+            raise
+
+    def map_file(self):
+        try:
+            self.mapped = mmap.mmap(self.raw.fileno(), 0, access=mmap.ACCESS_READ)
+        except (ValueError, OSError):  # tom fil eller ingen mmap
+            self.mapped = None
+            return
+        self.view = memoryview(self.mapped)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        if self.view is not None:
+            self.view.release()
+            try:
+                self.mapped.close()
+            except BufferError:
+                pass  # slices finns kvar hos anroparen; stängs när de släpps
+        if self.text is not None:
+            self.text.close()
+        else:
+            self.raw.close()
+
+    # csv.reader över raderna efter headern
+    def rows(self):
+        self.raw.seek(self.data_start)
+        self.text = io.TextIOWrapper(self.raw, encoding='utf-8', newline=None)
+        return csv.reader(self.text, delimiter=self.delimiter)
+
+    # (offset, data) per post efter headern
+    def records(self):
+        if self.view is None:
+            self.raw.seek(self.data_start)
+            return index_csv_records(self.raw)
+        view = self.view
+        return ((offset, view[offset:offset + length])
+                for offset, length in scan_records(self.mapped, self.data_start, len(self.mapped)))
+
+    # En post via offset/längd från records()
+    def record(self, offset, length):
+        if self.view is None:
+            self.raw.seek(offset)
+            return self.raw.read(length)
+        return self.view[offset:offset + length]
+
+    def size(self):
+        if self.view is not None:
+            return len(self.mapped)
+        self.raw.seek(0, io.SEEK_END)
+        return self.raw.tell()
+
+
+# Öppna exporten: avgränsare (om den inte anges) och BOM:ar känns av från början av filen
+def open_csv_input(path, delimiter=None):
+    return CsvInput(path, delimiter)
+
+
+def read_csv_header(path, delimiter=None):
+    with open_csv_input(path, delimiter) as source:
+        return source.fieldnames, source.delimiter
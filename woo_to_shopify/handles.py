@@ -0,0 +1,88 @@
+import csv
+from functools import lru_cache
+
+###################
+##### HANDLES #####
+###################
+# Tillåtna tecken i ett handle: a-z, 0-9, åäö och bindestreck (versaler görs
+# om till gemener). Blanktecken blir mellanslag och allt annat tas bort.
+# Tabellen fylls på vid första uppslaget av varje tecken.
+class HandleTable(dict):
+    def __missing__(self, code):
+        char = chr(code)
+        if char.isspace():
+            value = ' '
+        elif ('a' <= char <= 'z' or 'A' <= char <= 'Z' or '0' <= char <= '9'
+              or char in 'åäöÅÄÖ-'):
+            value = char.lower()
+        else:
+            value = None
+        self[code] = value
+        return value
+
+HANDLE_TABLE = HandleTable()
+
+# Vilka handles som är tagna i en konvertering. Varje konvertering har sitt
+# eget register, så flera kan köras i samma process. Per bas-handle sparas
+# nästa suffix att pröva, så en kollision kostar O(1) i stället för att
+# -1, -2, -3 … prövas om från början varje gång.
+class HandleRegistry:
+    def __init__(self, metrics=None, existing=()):
+        self.metrics = metrics
+        self.taken = set()
+        self.next_suffix = {}
+        self.preload(existing)
+
+    def __contains__(self, handle):
+        return handle in self.taken
+
+    def __len__(self):
+        return len(self.taken)
+
+    # Handles som redan finns (i Shopify-butiken eller från en tidigare körning)
+    def preload(self, handles):
+        self.taken.update(handle for handle in handles if handle)
+
+    # Reservera base_handle, eller base_handle-N med lägsta lediga N
+    def reserve(self, base_handle):
+        handle = base_handle
+        if handle in self.taken:
+            suffix = self.next_suffix.get(base_handle, 1)
+            handle = f"{base_handle}-{suffix}"
+            while handle in self.taken:
+                suffix += 1
+                handle = f"{base_handle}-{suffix}"
+            self.next_suffix[base_handle] = suffix + 1
+            if self.metrics is not None:
+                self.metrics.count('handles', 'collisions')
+        self.taken.add(handle)
+        return handle
+
+
+# Läs handles från en Shopify-export (kolumnen "Handle" eller "URL handle")
+def load_existing_handles(csv_path, delimiter=','):
+    with open(csv_path, 'r', encoding='utf-8-sig', newline='') as f:
+        reader = csv.reader(f, delimiter=delimiter)
+        header = next(reader, [])
+        column = next((c for c in ('Handle', 'URL handle') if c in header), None)
+        if column is None:
+            raise ValueError(f"❌ {csv_path} saknar kolumnen Handle / URL handle")
+        index = header.index(column)
+        return {row[index].strip() for row in reader if len(row) > index and row[index].strip()}
+
+
+####################
+# Function to sanitize titles
+####################
+# Varianter delar förälderns titel, så samma bas saneras om och om igen
+@lru_cache(maxsize=8192)
+def sanitize_title(title):
+    # Behåll bindestreck; blanktecken i följd blir ett '-'
+    return '-'.join(title.translate(HANDLE_TABLE).split())
+
+
+##################################################
+#  Generera ett URL-handle från titeln (för huvudprodukter i Shopify)
+##################################################
+def handle_from_title(title):
+    return sanitize_title(title.split('-')[0])
@@ -0,0 +1,80 @@
+from urllib.parse import quote
+
+###################################################################
+# Bildregister: varje bild-URL kodas och lagras en gång
+#
+# Woo-exportens Bilder/Images är en lista "url1, url2, ..." och alla
+# varianter i en produktfamilj upprepar oftast samma lista. Registret
+# kodar varje unik cell och varje unik URL bara en gång, så rader med
+# samma bilder delar samma strängobjekt, och produktgruppens bildlista
+# lagras som id:n (index i urls). Bildraderna skrivs sedan från registret
+# utan att cellen delas upp igen.
+# Varje konvertering (och varje arbetsprocess) har sitt eget register.
+# replacements (kodad URL → ersättnings-URL eller None) kommer från ett
+# bildmanifest (media.py): bilderna byts ut eller tas bort redan när
+# cellen kodas.
+###################################################################
+class ImageRegistry:
+    def __init__(self, replacements=None):
+        self.replacements = replacements or {}
+        self.urls = []      # id → kodad URL
+        self.ids = {}       # kodad URL → id
+        self.quoted = {}    # rå URL → kodad URL
+        self.cells = {}     # rå cell → kodad cell
+        self.lists = {}     # kodad cell → (id, id, ...)
+
+    def __len__(self):
+        return len(self.urls)
+
+    def quote_url(self, url):
+        quoted = self.quoted.get(url)
+        if quoted is None:
+            quoted = self.quoted[url] = quote(url.strip(), safe=':/')
+        return quoted
+
+    # Transform för Product image URL: varje URL i cellen kodas för sig
+    def quote_cell(self, value):
+        if not value:
+            return value
+        cell = self.cells.get(value)
+        if cell is None:
+            urls = [self.quote_url(url) for url in value.split(", ")]
+            if self.replacements:
+                urls = self.replace(urls)
+            cell = self.cells[value] = ", ".join(urls)
+        return cell
+
+    # Byt ut eller ta bort bilder enligt manifestet (en ersättningsbild högst en gång per cell)
+    def replace(self, urls):
+        replaced = []
+        for url in urls:
+            if url in self.replacements:
+                url = self.replacements[url]
+                if url is None or url in replaced:
+                    continue
+            replaced.append(url)
+        return replaced
+
+    def add(self, url):
+        image_id = self.ids.get(url)
+        if image_id is None:
+            image_id = self.ids[url] = len(self.urls)
+            self.urls.append(url)
+        return image_id
+
+    # Id:n för en kodad cell (tom cell → inga bilder)
+    def image_ids(self, cell):
+        if not cell:
+            return ()
+        ids = self.lists.get(cell)
+        if ids is None:
+            ids = self.lists[cell] = tuple(self.add(url) for url in cell.split(", "))
+        return ids
+
+    def url(self, image_id):
+        return self.urls[image_id]
+
+    # Första bilden i en kodad cell (Variant image URL)
+    def first_url(self, cell):
+        ids = self.image_ids(cell)
+        return self.urls[ids[0]] if ids else ''
@@ -0,0 +1,115 @@
+import os
+import json
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import unquote, urlsplit
+
+from .converter import CompiledMapping, apply_transforms, choose_mapping
+from .csvinput import open_csv_input
+
+###################################################################
+# Bildmanifest: kontrollera bilderna mot en lokal spegel före importen
+#
+# Trasiga bild-URL:er märks annars först när Shopify hämtar bilderna,
+# en i taget. check-images samlar alla unika URL:er som konverteringen
+# skriver i Product image URL/Variant image URL (samma kodning som i
+# bildregistret) och slår upp dem i en lokal kopia av wp-content/uploads:
+#   .../wp-content/uploads/2023/01/bild.jpg → <spegel>/2023/01/bild.jpg
+# Filerna kontrolleras i en trådpool (existens, storlek, sha256) och
+# resultatet sparas som JSON:
+#   {"mirror": ..., "images": {url: {"status", "path", "size", "sha256"}}}
+#   status  ok | missing (filen saknas) | empty (0 byte) | external (inte under uploads)
+# Konverteringen kan sedan läsa manifestet (--image-manifest) och ta bort
+# saknade/tomma bilder, eller byta dem mot en ersättningsbild (--missing-image).
+###################################################################
+UPLOADS = '/wp-content/uploads/'
+BROKEN = ('missing', 'empty')
+HASH_BLOCK = 1024 * 1024
+
+# Sökvägen i spegeln för en bild-URL, eller None om bilden inte ligger under uploads
+def mirror_path(url, mirror_dir):
+    path = unquote(urlsplit(url).path)
+    position = path.find(UPLOADS)
+    if position < 0:
+        return None
+    relative = path[position + len(UPLOADS):]
+    parts = [part for part in relative.split('/') if part not in ('', '.', '..')]
+    return os.path.join(mirror_dir, *parts) if parts else None
+
+
+def file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(HASH_BLOCK), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+# Kontrollera en bild; körs i trådpoolen
+def check_image(url, mirror_dir):
+    path = mirror_path(url, mirror_dir)
+    if path is None:
+        return url, {'status': 'external', 'path': None, 'size': None, 'sha256': None}
+    try:
+        size = os.path.getsize(path)
+    except OSError:
+        return url, {'status': 'missing', 'path': path, 'size': None, 'sha256': None}
+    if size == 0:
+        return url, {'status': 'empty', 'path': path, 'size': 0, 'sha256': None}
+    return url, {'status': 'ok', 'path': path, 'size': size, 'sha256': file_sha256(path)}
+
+
+# Alla unika bild-URL:er som konverteringen skulle skriva, i filordning
+def export_image_urls(input_file, delimiter=None, mapping=None):
+    with open_csv_input(input_file, delimiter) as source:
+        if mapping is None:
+            mapping = choose_mapping(source.fieldnames)
+        compiled = CompiledMapping(source.fieldnames, mapping)
+        image_fields = [(index, transforms) for index, column, transforms in compiled.fields
+                        if compiled.header[column] == 'Product image URL']
+        for row in source.rows():
+            for index, transforms in image_fields:
+                if index < len(row):
+                    compiled.images.image_ids(apply_transforms(row[index], transforms))
+    return list(compiled.images.urls)
+
+
+def build_image_manifest(urls, mirror_dir, workers=None):
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        images = dict(pool.map(lambda url: check_image(url, mirror_dir), urls))
+    return {'mirror': os.path.abspath(mirror_dir), 'images': images}
+
+
+def write_image_manifest(manifest, path):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+
+
+def load_image_manifest(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+# URL → ersättning (None = ta bort) för bilderna som saknas i spegeln
+def image_replacements(manifest, missing_image=None):
+    return {url: missing_image for url, entry in manifest['images'].items() if entry['status'] in BROKEN}
+
+
+# check-images: bygg manifestet för en export och skriv en sammanfattning
+def check_export_images(input_file, mirror_dir, manifest_file, delimiter=None, workers=None):
+    if not os.path.isdir(mirror_dir):
+        raise ValueError(f"❌ Spegelmappen finns inte: {mirror_dir}")
+    urls = export_image_urls(input_file, delimiter)
+    print(f"🖼️ {len(urls)} unika bilder i {input_file}, kontrolleras mot {mirror_dir}")
+    manifest = build_image_manifest(urls, mirror_dir, workers)
+    write_image_manifest(manifest, manifest_file)
+
+    statuses = {}
+    for entry in manifest['images'].values():
+        statuses[entry['status']] = statuses.get(entry['status'], 0) + 1
+    print("   " + ", ".join(f"{count} {status}" for status, count in sorted(statuses.items())))
+    for url, entry in manifest['images'].items():
+        if entry['status'] in BROKEN:
+            print(f"❗ {entry['status'].upper()}: {url}")
+    print(f"📝 Bildmanifest sparat: {manifest_file}")
+    return manifest
@@ -0,0 +1,82 @@
+import json
+import time
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+
+from .text import sanitize_html
+
+
+###################
+##### METRICS #####
+###################
+# Tidtagning per fas och räknare för en konvertering. Skrivs som JSON i slutet
+# av körningen (--metrics) så att nattjobben kan jämföras över tid.
+#   read      läsa/tolka CSV-rader
+#   map       fältmappning och övrig radtransformation (exkl. sanitize)
+#   sanitize  sanitize_html (bara med sanitize_timing, t.ex. --metrics; annars ingår den i map)
+#   coerce    typkonvertering av tal och flaggor (coerce_rows)
+#   group     gruppering per förälder + dubblettkontroll
+#   chunk     uppdelning av varianter i fotstorlekar/90-chunks
+#   write     skriva rader till output
+PHASES = ('read', 'map', 'sanitize', 'coerce', 'group', 'chunk', 'write')
+
+# sanitize_timing tar tid på varje sanitize_html-anrop. Det kostar två
+# perf_counter()-anrop per fält och rad och slås därför bara på när
+# fas-tiderna sparas.
+class ConversionMetrics:
+    def __init__(self, sanitize_timing=False):
+        self.sanitize_timing = sanitize_timing
+        self.phases = dict.fromkeys(PHASES, 0.0)
+        self.counters = defaultdict(Counter)
+        self.invalid_cells = []  # (kolumn, värde, SKU, titel), se coerce.py
+        self.started = time.time()
+        self.clock = time.perf_counter()
+
+    def add_time(self, phase, seconds):
+        self.phases[phase] += seconds
+
+    @contextmanager
+    def phase(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[name] += time.perf_counter() - start
+
+    def count(self, group, key, n=1):
+        self.counters[group][key] += n
+
+    # Slå ihop fas-tider/räknare från en arbetsprocess
+    def merge(self, other):
+        for phase, seconds in other.phases.items():
+            self.phases[phase] += seconds
+        for group, counts in other.counters.items():
+            self.counters[group].update(counts)
+        self.invalid_cells.extend(other.invalid_cells)
+
+    def as_dict(self):
+        phases = dict(self.phases)
+        # map mäts runt hela radtransformationen; sanitize redovisas separat
+        phases['map'] = max(phases['map'] - phases['sanitize'], 0.0)
+        return {
+            'started': time.strftime('%Y-%m-%dT%H:%M:%S', time.localtime(self.started)),
+            'elapsed': round(time.perf_counter() - self.clock, 4),
+            'phases': {phase: round(seconds, 4) for phase, seconds in phases.items()},
+            'counters': {group: dict(counts) for group, counts in self.counters.items()},
+        }
+
+    def write_json(self, path):
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.as_dict(), f, indent=2, ensure_ascii=False)
+        print(f"📈 Metrics sparade: {path}")
+
+
+# sanitize_html med tidtagning, används av den kompilerade mappningen
+def timed_sanitize(metrics):
+    def sanitize(value):
+        start = time.perf_counter()
+        try:
+            return sanitize_html(value)
+        finally:
+            metrics.phases['sanitize'] += time.perf_counter() - start
+    return sanitize
@@ -0,0 +1,99 @@
+import os
+import json
+
+try:
+    import tomllib
+except ImportError:  # Python < 3.11
+    try:
+        import tomli as tomllib
+    except ImportError:
+        tomllib = None
+
+try:
+    import yaml
+except ImportError:
+    yaml = None
+
+from .splitting import MAX_OPTION_VALUES, MAX_VARIANTS, check_split_limits
+
+###################################################################
+# Butiksprofiler
+#
+# En profil beskriver bara det som skiljer butikerna åt; resten av
+# konverteringen är gemensam. Profilen kan skrivas som JSON, TOML
+# (Python 3.11+ eller tomli) eller YAML (PyYAML):
+#   name              butikens namn i utskrifterna
+#   input, output     Woo-exporten och Shopify-filen
+#   delimiter         CSV-avgränsare (utelämnas → känns av från exporten)
+#   defaults          standardvärden för Shopify-fält, t.ex. Vendor
+#   category_columns  Woo-kolumner med kategorier, första icke-tomma används
+#   state, existing_handles, metrics, catalog
+#                     valfria filer/mappar för --state, --existing-handles, --metrics och --catalog
+#   variant_splits    regler för att dela upp stora familjer (se splitting.py), standard: fotstorlekar
+#   max_variants, max_option_values
+#                     högst antal varianter / värden per option i en Shopify-produkt
+#                     (standard 90 / 100, högst 100 / 100 som i Shopify)
+#   pack_option       packa delarna längs en option, t.ex. "Färg" (hela färger per produkt)
+# Relativa sökvägar räknas från profilfilens mapp.
+###################################################################
+PROFILE_KEYS = ('name', 'input', 'output', 'delimiter', 'defaults', 'category_columns', 'state', 'existing_handles', 'metrics',
+                'catalog', 'variant_splits', 'max_variants', 'max_option_values', 'pack_option')
+PATH_KEYS = ('input', 'output', 'state', 'existing_handles', 'metrics', 'catalog')
+
+class StoreProfile:
+    def __init__(self, name, input=None, output=None, delimiter=None, defaults=None,
+                 category_columns=('Kategorier', 'Categories'), state=None, existing_handles=None, metrics=None, catalog=None,
+                 variant_splits=None, max_variants=MAX_VARIANTS, max_option_values=MAX_OPTION_VALUES, pack_option=None):
+        self.name = name
+        self.input = input
+        self.output = output
+        self.delimiter = delimiter
+        self.defaults = dict(defaults or {})
+        self.category_columns = tuple(category_columns)
+        self.state = state
+        self.existing_handles = existing_handles
+        self.metrics = metrics
+        self.catalog = catalog
+        self.variant_splits = variant_splits
+        self.max_variants = max_variants
+        self.max_option_values = max_option_values
+        self.pack_option = pack_option
+
+    def __repr__(self):
+        return f"StoreProfile({self.name!r})"
+
+
+def read_profile_file(path):
+    extension = os.path.splitext(path)[1].lower()
+    with open(path, 'rb') as f:
+        data = f.read()
+
+    if extension == '.json':
+        return json.loads(data.decode('utf-8-sig'))
+    if extension == '.toml':
+        if tomllib is None:
+            raise ValueError(f"❌ {path}: TOML-profiler kräver Python 3.11+ eller paketet tomli")
+        return tomllib.loads(data.decode('utf-8-sig'))
+    if extension in ('.yaml', '.yml'):
+        if yaml is None:
+            raise ValueError(f"❌ {path}: YAML-profiler kräver paketet PyYAML")
+        return yaml.safe_load(data) or {}
+    raise ValueError(f"❌ {path}: okänt profilformat (använd .json, .toml eller .yaml)")
+
+
+def load_profile(path):
+    settings = read_profile_file(path)
+    if not isinstance(settings, dict):
+        raise ValueError(f"❌ {path}: profilen måste vara en tabell/ett objekt")
+
+    unknown = sorted(set(settings) - set(PROFILE_KEYS))
+    if unknown:
+        raise ValueError(f"❌ {path}: okända nycklar i profilen: {', '.join(unknown)}")
+
+    folder = os.path.dirname(os.path.abspath(path))
+    for key in PATH_KEYS:
+        if settings.get(key):
+            settings[key] = os.path.join(folder, os.path.expanduser(settings[key]))
+    settings.setdefault('name', os.path.basename(folder))
+    check_split_limits(settings.get('max_variants', MAX_VARIANTS), settings.get('max_option_values', MAX_OPTION_VALUES), path)
+    return StoreProfile(**settings)
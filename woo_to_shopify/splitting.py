@@ -0,0 +1,355 @@
+import json
+import zlib
+from bisect import bisect_right
+from math import ceil
+
+from .handles import sanitize_title
+
+###################################################################
+# Uppdelning av stora produktfamiljer i flera Shopify-produkter
+#
+# Shopify tar högst 100 varianter per produkt. Varianterna (utom den
+# första, som blir huvudraden) delas därför i delar om högst
+# max_variants (90) och högst max_option_values olika värden per
+# option (first fit, se chunks). Före det kan varianterna grupperas
+# efter en option med regler (variant_splits i profilen):
+#   {"option": "Foot Size", "ranges": [[0, 35, "34-"], [35, 39, "35-38"], ...]}
+#       heltalsvärdet slås upp med bisect (start ≤ värde < slut)
+#   {"option": "Färg", "values": {"Röd": "rod", "Mörkröd": "rod", ...}}
+#       värdet slås upp i en tabell
+#   {"option": "Storlek", "hash": 4}
+#       stabil hash (crc32) av värdet i 4 grupper: "1" … "4"
+# option matchas mot Option1/2/3 name (delsträng), första träffen med
+# ett värde som hör till en grupp vinner. Optionsnamnen har redan
+# översatts (option_value_mapping i converter.py, "Färg" → "Color") när
+# varianterna delas upp, så option matchas både som den står och översatt.
+# Varje grupp blir egna produkter med handle <handle>-<grupp>[-N], där
+# gruppnamnet saneras som ett handle ("Liten storlek" → "liten-storlek");
+# varianter utan grupp hamnar i <handle>[-N] med titeln "<titel> - N"
+# från del 2. Utan variant_splits används fotstorleksgrupperna nedan,
+# som tidigare.
+# Planen (vilka delar varje familj får) räknas ut innan gruppen skrivs
+# och sammanfattas efter körningen (--split-plan sparar den som JSON).
+#
+# Med pack_option (t.ex. "Färg") packas delarna i stället längs den
+# optionen (pack): alla varianter med samma värde hamnar i samma produkt
+# när det går, antalet produkter blir så litet som möjligt och
+# storlekarna jämnas ut, så 95 varianter blir 48 + 47 i stället för
+# 90 + 5 och en "-2"-produkt med en ensam variant undviks. Familjer som
+# behöver delas men saknar optionen delas i följd och räknas upp i
+# sammanfattningen, liksom regler vars option inte fanns i någon variant.
+###################################################################
+MAX_VARIANTS = 90
+MAX_OPTION_VALUES = 100
+SHOPIFY_MAX_VARIANTS = 100       # Shopifys gräns per produkt
+SHOPIFY_MAX_OPTION_VALUES = 100
+OPTION_FIELDS = (("Option1 name", "Option1 value"), ("Option2 name", "Option2 value"), ("Option3 name", "Option3 value"))
+
+DEFAULT_SPLITS = [
+    {"option": "Foot Size", "ranges": [[0, 35, "34-"], [35, 39, "35-38"], [39, 43, "39-42"], [43, 47, "43-46"]]},
+]
+
+# Gruppens namn blir en del av handle och saneras som ett handle ("Liten storlek" → "liten-storlek")
+def bucket_label(label):
+    handle = sanitize_title(str(label))
+    if not handle:
+        raise ValueError(f"❌ variant_splits: gruppnamnet {label!r} ger inget giltigt handle")
+    return handle
+
+
+# Heltalsintervall [start, slut) → grupp
+class RangeBuckets:
+    def __init__(self, ranges):
+        self.ranges = sorted((int(start), int(end), bucket_label(label)) for start, end, label in ranges)
+        for (_, end, label), (start, _, _) in zip(self.ranges, self.ranges[1:]):
+            if start < end:
+                raise ValueError(f"❌ variant_splits: intervallen överlappar vid {label}")
+        self.starts = [start for start, _, _ in self.ranges]
+
+    def bucket(self, value):
+        try:
+            number = int(value)
+        except ValueError:
+            return None
+        i = bisect_right(self.starts, number) - 1
+        if i < 0:
+            return None
+        _, end, label = self.ranges[i]
+        return label if number < end else None
+
+
+class ValueBuckets:
+    def __init__(self, values):
+        self.values = {str(value): bucket_label(label) for value, label in values.items()}
+
+    # Värdena översätts som optionsnamnen (option_value_mapping), så de slås upp båda vägarna
+    def translate(self, names):
+        for value, label in list(self.values.items()):
+            self.values.setdefault(names.get(value, value), label)
+
+    def bucket(self, value):
+        return self.values.get(value.strip())
+
+
+class HashBuckets:
+    def __init__(self, count):
+        self.count = int(count)
+        if self.count < 1:
+            raise ValueError("❌ variant_splits: hash måste vara minst 1")
+
+    def bucket(self, value):
+        value = value.strip()
+        if not value:
+            return None
+        return str(zlib.crc32(value.encode('utf-8')) % self.count + 1)
+
+
+class SplitRule:
+    def __init__(self, option, buckets):
+        self.option = option
+        self.names = (option,)
+        self.buckets = buckets
+
+
+def parse_split_rule(settings):
+    if not isinstance(settings, dict) or not settings.get('option'):
+        raise ValueError(f"❌ variant_splits: varje regel behöver en option: {settings!r}")
+    kinds = [kind for kind in ('ranges', 'values', 'hash') if kind in settings]
+    if len(kinds) != 1:
+        raise ValueError(f"❌ variant_splits: ange precis en av ranges, values eller hash för {settings['option']}")
+    kind = kinds[0]
+    if kind == 'ranges':
+        buckets = RangeBuckets(settings['ranges'])
+    elif kind == 'values':
+        buckets = ValueBuckets(settings['values'])
+    else:
+        buckets = HashBuckets(settings['hash'])
+    return SplitRule(settings['option'], buckets)
+
+
+# En del av en familj: blir en egen Shopify-produkt
+class SplitPart:
+    __slots__ = ('bucket', 'number', 'variants')
+
+    def __init__(self, bucket, number, variants):
+        self.bucket = bucket
+        self.number = number
+        self.variants = variants
+
+    def base_handle(self, handle):
+        if self.bucket is None:
+            return handle if self.number == 1 else f"{handle}-{self.number}"
+        return f"{handle}-{self.bucket}" if self.number == 1 else f"{handle}-{self.bucket}-{self.number}"
+
+    def title(self, title):
+        if self.bucket is None and self.number > 1:
+            return f"{title} - {self.number}"
+        return title
+
+
+# Delar en lista i n delar i följd med så jämn storlek som möjligt
+def even_slices(items, n):
+    size, extra = divmod(len(items), n)
+    slices, start = [], 0
+    for i in range(n):
+        end = start + size + (1 if i < extra else 0)
+        slices.append(items[start:end])
+        start = end
+    return slices
+
+
+# Gränserna som heltal; utanför 1 … Shopifys gräns går de inte att importera.
+# where (t.ex. profilfilen) står först i felmeddelandet.
+def check_split_limits(max_variants, max_option_values, where=None):
+    prefix = f"{where}: " if where else ""
+    limits = []
+    for name, value, shopify_max in (('max_variants', max_variants, SHOPIFY_MAX_VARIANTS),
+                                     ('max_option_values', max_option_values, SHOPIFY_MAX_OPTION_VALUES)):
+        try:
+            value = int(value)
+        except (TypeError, ValueError):
+            raise ValueError(f"❌ {prefix}{name} måste vara ett heltal: {value!r}")
+        if not 1 <= value <= shopify_max:
+            raise ValueError(f"❌ {prefix}{name} måste vara mellan 1 och {shopify_max} (Shopifys gräns): {value}")
+        limits.append(value)
+    return limits
+
+
+class VariantSplitter:
+    # option_names: originalnamn → namnet i Shopify-raderna (option_value_mapping)
+    def __init__(self, rules=None, max_variants=MAX_VARIANTS, max_option_values=MAX_OPTION_VALUES, pack_option=None,
+                 option_names=None):
+        self.option_names = option_names or {}
+        self.explicit_rules = rules is not None
+        self.rules = [parse_split_rule(rule) for rule in (DEFAULT_SPLITS if rules is None else rules)]
+        for rule in self.rules:
+            rule.names = self.names_for(rule.option)
+            if isinstance(rule.buckets, ValueBuckets):
+                rule.buckets.translate(self.option_names)
+        self.max_variants, self.max_option_values = check_split_limits(max_variants, max_option_values)
+        self.pack_option = pack_option
+        self.pack_names = self.names_for(pack_option) if pack_option else ()
+        self.plan = []
+        self.matched_options = set()  # regler (option) som matchade någon variant
+        self.unpacked = []            # handles som behövde delas men saknade pack_option
+
+    # Optionen som den står och översatt
+    def names_for(self, option):
+        translated = self.option_names.get(option, option)
+        return (option,) if translated == option else (option, translated)
+
+    @staticmethod
+    def matches(names, option_name):
+        return any(name in option_name for name in names)
+
+    # Gruppen för en variant, eller None
+    def bucket(self, variant):
+        for rule in self.rules:
+            for name_field, value_field in OPTION_FIELDS:
+                if self.matches(rule.names, variant.get(name_field, "")):
+                    self.matched_options.add(rule.option)
+                    label = rule.buckets.bucket(variant.get(value_field, ""))
+                    if label:
+                        return label
+        return None
+
+    # Dela en lista varianter i delar om högst max_variants och högst max_option_values
+    # olika värden per option. Varje variant läggs i första delen där den får plats
+    # (first fit); när bara antalet varianter begränsar blir det samma som att dela
+    # listan i följd.
+    def chunks(self, variants):
+        chunks = []  # [varianter, [värden för option 1, 2, 3]]
+        first_open = 0
+        for variant in variants:
+            values = [variant.get(value_field, "") for _, value_field in OPTION_FIELDS]
+            for chunk in chunks[first_open:]:
+                if len(chunk[0]) < self.max_variants and self.fits(values, chunk[1]):
+                    break
+            else:
+                chunk = [[], [set(), set(), set()]]
+                chunks.append(chunk)
+            chunk[0].append(variant)
+            for value, option_values in zip(values, chunk[1]):
+                option_values.add(value)
+            while first_open < len(chunks) and len(chunks[first_open][0]) >= self.max_variants:
+                first_open += 1
+        return [chunk[0] for chunk in chunks]
+
+    def fits(self, values, seen):
+        return all(value in option_values or len(option_values) < self.max_option_values
+                   for value, option_values in zip(values, seen))
+
+    # Värdet för pack_option i en variant (None om varianten saknar optionen)
+    def pack_value(self, variant):
+        for name_field, value_field in OPTION_FIELDS:
+            if self.matches(self.pack_names, variant.get(name_field, "")):
+                return variant.get(value_field, "")
+        return None
+
+    # Packning längs pack_option: varianterna samlas per värde; värden med fler
+    # varianter än max_variants delas i jämna bitar, och värden med fler olika
+    # värden i en annan option än max_option_values delas med chunks. Bitarna placeras störst först
+    # i den minst fyllda delen där de får plats (worst fit decreasing), med från
+    # början så få delar som antalet varianter kräver. Delarna och varianterna i dem
+    # behåller ordningen från exporten.
+    def pack(self, variants):
+        if not variants:
+            return []
+        by_value = {}
+        for position, variant in enumerate(variants):
+            by_value.setdefault(self.pack_value(variant) or "", []).append((position, variant))
+
+        pieces = []
+        for items in by_value.values():
+            if self.too_many_values(items):
+                # Värdet har fler olika värden i en annan option än max_option_values:
+                # dela det med first fit (chunks) så att båda gränserna håller
+                positions = {id(variant): position for position, variant in items}
+                pieces.extend([(positions[id(variant)], variant) for variant in chunk]
+                              for chunk in self.chunks([variant for _, variant in items]))
+            else:
+                pieces.extend(even_slices(items, ceil(len(items) / self.max_variants)))
+        pieces.sort(key=len, reverse=True)
+
+        bins = [[[], [set(), set(), set()]] for _ in range(ceil(len(variants) / self.max_variants))]
+        for piece in pieces:
+            values = [{variant.get(value_field, "") for _, variant in piece} for _, value_field in OPTION_FIELDS]
+            candidates = [chunk for chunk in bins if len(chunk[0]) + len(piece) <= self.max_variants
+                          and self.piece_fits(values, chunk[1])]
+            if candidates:
+                chunk = min(candidates, key=lambda chunk: len(chunk[0]))
+            else:
+                chunk = [[], [set(), set(), set()]]
+                bins.append(chunk)
+            chunk[0].extend(piece)
+            for piece_values, option_values in zip(values, chunk[1]):
+                option_values.update(piece_values)
+
+        packed = [sorted(chunk[0], key=lambda item: item[0]) for chunk in bins if chunk[0]]
+        packed.sort(key=lambda items: items[0][0])
+        return [[variant for _, variant in items] for items in packed]
+
+    def too_many_values(self, items):
+        return any(len({variant.get(value_field, "") for _, variant in items}) > self.max_option_values
+                   for _, value_field in OPTION_FIELDS)
+
+    def piece_fits(self, values, seen):
+        return all(len(option_values | piece_values) <= self.max_option_values
+                   for piece_values, option_values in zip(values, seen))
+
+    # Delarna för en familj i skrivordning: grupperna i den ordning de
+    # först förekommer, sedan varianterna utan grupp
+    def split(self, handle, variants):
+        grouped = {}
+        rest = []
+        for variant in variants:
+            label = self.bucket(variant)
+            if label is None:
+                rest.append(variant)
+            else:
+                grouped.setdefault(label, []).append(variant)
+
+        if (self.pack_option and len(variants) > self.max_variants
+                and all(self.pack_value(variant) is None for variant in variants)):
+            self.unpacked.append(handle)
+
+        parts = []
+        for label, group_variants in list(grouped.items()) + [(None, rest)]:
+            chunks = self.pack(group_variants) if self.pack_option else self.chunks(group_variants)
+            for number, chunk in enumerate(chunks, start=1):
+                parts.append(SplitPart(label, number, chunk))
+        if len(parts) > 1 or any(part.bucket is not None for part in parts):
+            self.plan.append({
+                'handle': handle,
+                'parts': [{'handle': part.base_handle(handle), 'bucket': part.bucket, 'variants': len(part.variants)}
+                          for part in parts],
+            })
+        return parts
+
+
+def splitter_for_profile(profile, option_names=None):
+    return VariantSplitter(profile.variant_splits, profile.max_variants, profile.max_option_values, profile.pack_option,
+                           option_names)
+
+
+# Sammanfattning av uppdelningen; med path sparas hela planen som JSON
+def report_split_plan(splitter, metrics, path=None):
+    parts = sum(len(entry['parts']) for entry in splitter.plan)
+    metrics.count('splits', 'families', len(splitter.plan))
+    metrics.count('splits', 'parts', parts)
+    if splitter.plan:
+        print(f"✂️ {len(splitter.plan)} produktfamiljer delades upp i {parts} produkter "
+              f"(högst {splitter.max_variants} varianter per produkt)")
+    if splitter.explicit_rules:
+        for rule in splitter.rules:
+            if rule.option not in splitter.matched_options:
+                print(f"⚠️ variant_splits: optionen {rule.option!r} fanns inte i någon variant")
+    if splitter.unpacked:
+        metrics.count('splits', 'unpacked', len(splitter.unpacked))
+        examples = ', '.join(splitter.unpacked[:5])
+        print(f"⚠️ pack_option {splitter.pack_option!r} fanns inte i {len(splitter.unpacked)} familjer som delades upp; "
+              f"de delades i följd (t.ex. {examples})")
+    if path:
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(splitter.plan, f, indent=2, ensure_ascii=False)
+        print(f"📝 Uppdelningsplan sparad: {path}")
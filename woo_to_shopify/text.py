@@ -0,0 +1,47 @@
+##################
+##### TEXT #######
+##################
+def clean_value(value):
+    if value == "[]" or value.strip() == "[]":
+        return ""
+    return value.strip()
+
+# Körs på alla mappade fält, så det vanliga fallet – ett kort fält utan
+# radbrytningar, dubbla mellanslag eller citattecken – returneras direkt.
+# Ingen regex: str.split() delar på samma blanktecken som \s och tar samtidigt
+# bort dem i början och slutet.
+def sanitize_html(value):
+    if not isinstance(value, str):
+        return ""
+
+    # isprintable() är False för alla blanktecken utom vanligt mellanslag
+    if (value.isprintable() and '"' not in value and '  ' not in value and '\\n' not in value
+            and value[:1] != ' ' and value[-1:] != ' '):
+        return value
+
+    if not value or value.isspace():
+        return ""
+
+    # Ersätt radbrytningar (backslash n) med <br>-taggar
+    if '\n' in value:
+        value = value.replace('\r\n', '<br>').replace('\n', '<br>')
+    if '\\n' in value:
+        value = value.replace('\\n', '<br>')
+
+    # Ta bort flera mellanslag i rad (och mellanslag i början/slutet)
+    value = ' '.join(value.split())
+
+    # Escapa citattecken för att passa CSV-formatet
+    if '"' in value:
+        value = value.replace('"', '""')
+
+    return value
+
+#  Extrahera produktkategori + skapa taggar
+def extract_categories(category_string):
+    if not category_string or category_string.strip() == "":
+        return "", ""
+    categories = [c.strip() for c in category_string.split(">")]
+    product_type = categories[0]
+    tags = ", ".join(categories)
+    return product_type, tags
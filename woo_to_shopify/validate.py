@@ -0,0 +1,320 @@
+import json
+
+from .csvinput import open_csv_input
+
+###################################################################
+# Validering av en Shopify-CSV i ett enda pass
+#
+# Ersätter de fristående skripten validate_csv.py, count_products_ths.py
+# och duplicate_handle_csv.py som läste filen var för sig. Varje rad
+# skickas till alla regler via en RowValidator, antingen när filen läses
+# (validate_shopify_csv) eller direkt när konverteringen skriver raden
+# (ShopifyWriter), så att output inte behöver läsas om. En regel har
+# start(columns), row(line, row, source) och result(); den lagrar bara
+# räknare och högst MAX_EXAMPLES exempel, så minnet är konstant utom
+# handle-mängden i duplicate_handles. source är radnumret i Woo-exporten
+# som raden kommer från (bara i konverteringen).
+#   row_length          rader med fel antal kolumner mot headern
+#   main_products       rader med titel (huvudprodukter)
+#   duplicate_handles   huvudprodukter (titel + beskrivning eller taggar) med samma handle
+#   missing_handle      rader utan URL handle
+#   orphan_rows         rader utan titel vars handle inte hör till produkten ovanför
+#   variant_limit       handles med fler än 100 varianter (Shopifys gräns)
+#   option_names        varianter vars optionsnamn skiljer sig från huvudproduktens
+#   missing_sku         varianter (och huvudrader) utan SKU
+# Resultatet är en rapport (dict) som kan sparas som JSON (--report).
+###################################################################
+MAX_EXAMPLES = 20
+PRINTED_EXAMPLES = 5
+MAX_VARIANTS = 100
+OPTION_NAMES = ('Option1 name', 'Option2 name', 'Option3 name')
+
+# Kolumnerna som reglerna använder: namn → index (None om kolumnen saknas).
+# Rubrikerna jämförs utan blanktecken och skiftläge, som i count_products_ths.py.
+class ValidationColumns:
+    def __init__(self, header):
+        self.header = header
+        index = {}
+        for i, name in enumerate(header):
+            index.setdefault(name.strip().lower(), i)
+        self.index = index
+        self.title = self.find('Title')
+        self.sku = self.find('SKU')
+        self.option_value = self.find('Option1 value')
+        self.price = self.find('Price')
+        self.image = self.find('Product image URL')
+
+    def __len__(self):
+        return len(self.header)
+
+    def find(self, name):
+        return self.index.get(name.lower())
+
+    # Extra bildrad: bara handle och bild (ingen titel, SKU, option eller pris)
+    def is_image_row(self, row):
+        return bool(cell(row, self.image)) and not (cell(row, self.title) or cell(row, self.sku)
+                                                    or cell(row, self.option_value) or cell(row, self.price))
+
+
+# Cellen som text; rader från konverteringen kan innehålla tal och flaggor
+def cell(row, i):
+    if i is None or i >= len(row):
+        return ""
+    value = row[i]
+    if value.__class__ is not str:
+        return "" if value is None else str(value)
+    return value.strip()
+
+
+class ValidationRule:
+    name = None
+
+    def start(self, columns):
+        self.columns = columns
+        self.count = 0
+        self.examples = []
+
+    def add_issue(self, example, source=None):
+        self.count += 1
+        if len(self.examples) < MAX_EXAMPLES:
+            if source is not None:
+                example['source'] = source
+            self.examples.append(example)
+
+    def row(self, line, row, source=None):
+        raise NotImplementedError
+
+    def result(self):
+        return {'ok': self.count == 0, 'count': self.count, 'examples': self.examples}
+
+
+class RowLengthRule(ValidationRule):
+    name = 'row_length'
+
+    def row(self, line, row, source=None):
+        if len(row) != len(self.columns):
+            self.add_issue({'line': line, 'columns': len(row), 'expected': len(self.columns)}, source)
+
+
+# Bara en räkning, ger aldrig fel
+class MainProductCountRule(ValidationRule):
+    name = 'main_products'
+
+    def start(self, columns):
+        super().start(columns)
+        self.title = columns.find('Title')
+
+    def row(self, line, row, source=None):
+        if cell(row, self.title):
+            self.count += 1
+
+    def result(self):
+        if self.title is None:
+            return {'ok': False, 'count': 0, 'error': "Title-kolumnen saknas"}
+        return {'ok': True, 'count': self.count}
+
+
+class DuplicateHandleRule(ValidationRule):
+    name = 'duplicate_handles'
+
+    def start(self, columns):
+        super().start(columns)
+        self.title = columns.find('Title')
+        self.description = columns.find('Description')
+        self.tags = columns.find('Tags')
+        self.handle = columns.find('URL handle')
+        self.handles = set()
+        self.duplicates = {}  # handle → antal förekomster, bara för dubbletter
+
+    # Huvudprodukt: har titel och antingen beskrivning eller taggar
+    def row(self, line, row, source=None):
+        handle = cell(row, self.handle)
+        if not handle or not cell(row, self.title) or not (cell(row, self.description) or cell(row, self.tags)):
+            return
+        if handle not in self.handles:
+            self.handles.add(handle)
+            return
+        self.duplicates[handle] = self.duplicates.get(handle, 1) + 1
+        self.add_issue({'line': line, 'handle': handle}, source)
+
+    def result(self):
+        duplicates = sorted(self.duplicates.items(), key=lambda item: -item[1])
+        return {'ok': not duplicates, 'count': len(duplicates), 'unique_handles': len(self.handles),
+                'examples': [{'handle': handle, 'count': count} for handle, count in duplicates[:MAX_EXAMPLES]]}
+
+
+class MissingHandleRule(ValidationRule):
+    name = 'missing_handle'
+
+    def start(self, columns):
+        super().start(columns)
+        self.handle = columns.find('URL handle')
+
+    def row(self, line, row, source=None):
+        if not cell(row, self.handle):
+            self.add_issue({'line': line}, source)
+
+
+# Varianter och bildrader ska följa direkt efter sin huvudprodukt
+class OrphanRowRule(ValidationRule):
+    name = 'orphan_rows'
+
+    def start(self, columns):
+        super().start(columns)
+        self.title = columns.find('Title')
+        self.handle = columns.find('URL handle')
+        self.current = None
+
+    def row(self, line, row, source=None):
+        handle = cell(row, self.handle)
+        if cell(row, self.title):
+            self.current = handle
+        elif handle and handle != self.current:
+            self.add_issue({'line': line, 'handle': handle}, source)
+
+
+# Raderna för ett handle ligger i följd, så det räcker att räkna för aktuellt handle
+class VariantLimitRule(ValidationRule):
+    name = 'variant_limit'
+
+    def start(self, columns):
+        super().start(columns)
+        self.handle = columns.find('URL handle')
+        self.current = None
+        self.variants = 0
+
+    def row(self, line, row, source=None):
+        handle = cell(row, self.handle)
+        if handle != self.current:
+            self.current = handle
+            self.variants = 0
+        if self.columns.is_image_row(row):
+            return
+        self.variants += 1
+        if self.variants == MAX_VARIANTS + 1:
+            self.add_issue({'line': line, 'handle': handle, 'limit': MAX_VARIANTS}, source)
+
+
+class OptionNamesRule(ValidationRule):
+    name = 'option_names'
+
+    def start(self, columns):
+        super().start(columns)
+        self.options = [columns.find(name) for name in OPTION_NAMES]
+        self.names = ()
+
+    def row(self, line, row, source=None):
+        names = tuple(cell(row, i) for i in self.options)
+        if cell(row, self.columns.title):
+            self.names = names
+        elif any(names) and names != self.names and not self.columns.is_image_row(row):
+            self.add_issue({'line': line, 'options': list(names), 'expected': list(self.names)}, source)
+
+
+class MissingSkuRule(ValidationRule):
+    name = 'missing_sku'
+
+    def row(self, line, row, source=None):
+        if not cell(row, self.columns.sku) and not self.columns.is_image_row(row):
+            self.add_issue({'line': line}, source)
+
+
+VALIDATION_RULES = {rule.name: rule for rule in (
+    RowLengthRule, MainProductCountRule, DuplicateHandleRule, MissingHandleRule, OrphanRowRule,
+    VariantLimitRule, OptionNamesRule, MissingSkuRule,
+)}
+
+def make_rules(names=None):
+    names = list(VALIDATION_RULES) if not names else names
+    unknown = [name for name in names if name not in VALIDATION_RULES]
+    if unknown:
+        raise ValueError(f"❌ Okända valideringsregler: {', '.join(unknown)} (finns: {', '.join(VALIDATION_RULES)})")
+    return [VALIDATION_RULES[name]() for name in names]
+
+
+# Skickar rad för rad till reglerna. Radnummer räknas som i validate_csv.py: headern är rad 1.
+class RowValidator:
+    def __init__(self, rules=None):
+        self.rules = make_rules() if rules is None else rules
+        self.columns = None
+
+    def start(self, header):
+        self.columns = ValidationColumns(list(header))
+        self.line = 1
+        self.rows = 0
+        for rule in self.rules:
+            rule.start(self.columns)
+
+    def check(self, row, source=None, line=None):
+        self.line = self.line + 1 if line is None else line
+        self.rows += 1
+        for rule in self.rules:
+            rule.row(self.line, row, source)
+
+    def report(self, path):
+        results = {rule.name: rule.result() for rule in self.rules}
+        return {
+            'file': path,
+            'columns': len(self.columns),
+            'rows': self.rows,
+            'ok': all(result['ok'] for result in results.values()),
+            'rules': results,
+        }
+
+
+# Kör reglerna över en färdig fil i ett pass
+def validate_shopify_csv(path, rules=None, delimiter=None):
+    validator = RowValidator(rules)
+    with open_csv_input(path, delimiter) as source:
+        validator.start(source.fieldnames)
+        for line, row in enumerate(source.rows(), start=2):
+            if row:
+                validator.check(row, line=line)
+
+    report = validator.report(path)
+    report['delimiter'] = source.delimiter
+    return report
+
+
+def print_validation_report(report):
+    print(f"🔎 {report['file']}: {report['rows']} rader, {report['columns']} kolumner")
+    for name, result in report['rules'].items():
+        if name == 'main_products':
+            if 'error' in result:
+                print(f"❌ {result['error']}")
+            else:
+                print(f"📦 Antal produkter med titel (huvudprodukter): {result['count']}")
+            continue
+        if name == 'duplicate_handles':
+            print(f"🔍 Totalt antal huvudprodukter med unika handles: {result['unique_handles']}")
+        status = "✅" if result['ok'] else "⚠️"
+        print(f"{status} {name}: {result['count']}")
+        for example in result.get('examples', [])[:PRINTED_EXAMPLES]:
+            print(f"   - {', '.join(f'{key}={value}' for key, value in example.items())}")
+    print("✅ Inga fel hittades" if report['ok'] else "⚠️ Filen har fel, se ovan")
+
+
+# Kort sammanfattning efter en konvertering: bara reglerna som hittade fel räknas upp.
+# Antalet fel per regel hamnar även i metrics (violations).
+def report_violations(validator, metrics, output_file, path=None):
+    report = validator.report(output_file)
+    for name, result in report['rules'].items():
+        if name != 'main_products' and result['count']:
+            metrics.count('violations', name, result['count'])
+
+    failed = {name: result for name, result in report['rules'].items() if not result['ok']}
+    if failed:
+        print(f"⚠️ Valideringen av {output_file} hittade fel:")
+        for name, result in failed.items():
+            first = result.get('examples', [{}])[:1]
+            where = ', '.join(f'{key}={value}' for key, value in first[0].items()) if first else ''
+            print(f"   {name}: {result['count']} st{f' (t.ex. {where})' if where else ''}")
+    if path:
+        write_validation_report(report, path)
+    return report
+
+
+def write_validation_report(report, path):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+    print(f"📝 Valideringsrapport sparad: {path}")